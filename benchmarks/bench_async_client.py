@@ -0,0 +1,80 @@
+"""
+Per-call overhead and import time of the httpx AsyncYoutubeClient compared with
+googleapiclient, against the local fake API.
+
+Both sides make raw videos.list calls: googleapiclient through
+request.execute() on one service, without YoutubeTool's rate limiter, request
+coalescing or quota accounting. The fake API speaks HTTP/1.1, so both clients
+reuse keep-alive connections.
+
+    python benchmarks/bench_async_client.py --calls 500
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+from fake_youtube_api import FakeYoutubeAPI
+
+from tools.google import AsyncYoutubeClient
+
+
+def import_time(module: str, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_googleapiclient(endpoint: str, calls: int) -> float:
+    from googleapiclient.discovery import build_from_document
+
+    from tools.google.google_apis import get_discovery_document
+
+    service = build_from_document(
+        get_discovery_document("youtube", "v3"),
+        developerKey="fake",
+        client_options={"api_endpoint": endpoint},
+    )
+    start = time.perf_counter()
+    for _ in range(calls):
+        service.videos().list(part="snippet", id="dQw4w9WgXcQ").execute()
+    return time.perf_counter() - start
+
+
+async def bench_httpx(endpoint: str, calls: int, concurrency: int) -> float:
+    async with AsyncYoutubeClient(api_key="fake", base_url=endpoint) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                await client.videos_list(part="snippet", id="dQw4w9WgXcQ")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(calls)))
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    with FakeYoutubeAPI() as api:
+        google = bench_googleapiclient(api.endpoint, args.calls)
+        sequential = asyncio.run(bench_httpx(api.endpoint, args.calls, 1))
+        concurrent = asyncio.run(bench_httpx(api.endpoint, args.calls, 20))
+
+    print(f"{args.calls} videos.list calls")
+    print(f"  googleapiclient        : {google / args.calls * 1e6:8.0f} us/call")
+    print(f"  httpx sequential       : {sequential / args.calls * 1e6:8.0f} us/call")
+    print(f"  httpx 20 concurrent    : {concurrent / args.calls * 1e6:8.0f} us/call")
+    google_import = import_time("googleapiclient.discovery")
+    httpx_import = import_time("httpx")
+    print("import time")
+    print(f"  googleapiclient        : {google_import * 1000:8.1f} ms")
+    print(f"  httpx                  : {httpx_import * 1000:8.1f} ms")
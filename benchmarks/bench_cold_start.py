@@ -0,0 +1,207 @@
+"""
+Cold-start benchmark of the MCP server entry point.
+
+Spawns mcp_youtube_server.py over stdio the way an MCP host does and measures
+the time from process start to the first tools/list response and to the first
+tool result. The tool called is Extract Video Id, which needs no network, so
+only startup cost is measured.
+
+It also breaks down the import time of the server module with -X importtime
+and fails when the imports exceed a budget, or when modules that should load
+on first use (the Google API client and youtube_transcript_api) are imported
+at startup.
+
+    python benchmarks/bench_cold_start.py --runs 5 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER = os.path.join(ROOT, "mcp_youtube_server.py")
+
+# Modules the server must not import before they are first needed
+LAZY_MODULES = (
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "google_auth_httplib2",
+    "youtube_transcript_api",
+)
+
+
+def _rpc(process: subprocess.Popen, message: dict) -> dict | None:
+    """
+    Send a JSON-RPC message and wait for the response with the same ID.
+    """
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+    if "id" not in message:
+        return None
+
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("Server exited before responding")
+
+        response = json.loads(line)
+        if response.get("id") == message["id"]:
+            if "error" in response:
+                raise RuntimeError(f"Server error: {response['error']}")
+            return response
+
+
+def measure_session(workdir: str) -> dict:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, SERVER],
+        cwd=workdir,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+
+    try:
+        _rpc(
+            process,
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {},
+                    "clientInfo": {"name": "bench-cold-start", "version": "0"},
+                },
+            },
+        )
+        initialized = time.perf_counter()
+        _rpc(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+        _rpc(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools_listed = time.perf_counter()
+
+        _rpc(
+            process,
+            {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "method": "tools/call",
+                "params": {
+                    "name": "Extract Video Id",
+                    "arguments": {"input_str": "https://youtu.be/dQw4w9WgXcQ"},
+                },
+            },
+        )
+        first_result = time.perf_counter()
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    return {
+        "initialize": initialized - start,
+        "tools_list": tools_listed - start,
+        "first_result": first_result - start,
+    }
+
+
+def import_breakdown(workdir: str) -> tuple[float, list[tuple[str, float]], set]:
+    """
+    Import the server module under -X importtime.
+
+    Returns:
+        tuple: Total import time of the server module in seconds, the
+            cumulative time of each of its direct imports, and the names of
+            all modules it imported
+    """
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_youtube_server"],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    # Imports are listed children first, nesting shown by indentation
+    children, modules = [], set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+
+        if depth == 0:
+            if name == "mcp_youtube_server":
+                return (
+                    int(cumulative_us) / 1e6,
+                    sorted(children, key=lambda item: -item[1]),
+                    modules,
+                )
+            children, modules = [], set()
+        else:
+            modules.add(name)
+            if depth == 1:
+                children.append((name, int(cumulative_us) / 1e6))
+
+    raise RuntimeError("mcp_youtube_server was not imported")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=1500,
+        help="Maximum import time of the server module",
+    )
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # A scratch working directory keeps the caches the server creates out of
+    # the repository and makes every run cold
+    with tempfile.TemporaryDirectory() as workdir:
+        sessions = [measure_session(workdir) for _ in range(args.runs)]
+        total, top_level, modules = import_breakdown(workdir)
+
+    print(f"Cold start over {args.runs} runs (median):")
+    for key, label in (
+        ("initialize", "initialize response"),
+        ("tools_list", "tools/list response"),
+        ("first_result", "first tool result"),
+    ):
+        median = statistics.median(session[key] for session in sessions)
+        print(f"  process start -> {label:<20}: {median * 1000:8.1f} ms")
+
+    print(f"\nImport time of mcp_youtube_server: {total * 1000:.1f} ms")
+    for name, cumulative in top_level[: args.top]:
+        print(f"  {name:<40} {cumulative * 1000:8.1f} ms")
+
+    failures = []
+    if total * 1000 > args.budget_ms:
+        failures.append(
+            f"import time {total * 1000:.1f} ms exceeds budget {args.budget_ms} ms"
+        )
+    for module in LAZY_MODULES:
+        if any(name.split(".")[0] == module for name in modules):
+            failures.append(f"{module} is imported at startup")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+    print(f"\nOK: within the {args.budget_ms} ms budget, lazy modules not loaded")
@@ -0,0 +1,66 @@
+"""
+Concurrency benchmark: many simultaneous tool calls against a fake API with
+simulated latency.
+
+Compares calling the blocking YoutubeTool methods directly on the event loop,
+as the server did before, with running them through the WorkerPool. Each run
+gets its own YoutubeTool and cache directory, so cached search pages of one
+run are not served to the other.
+
+    python benchmarks/bench_concurrency.py --calls 32 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import time
+
+from fake_youtube_api import FakeYoutubeAPI, fake_youtube_tool
+
+from tools.google import WorkerPool
+
+
+async def run_blocking(func, calls: int) -> float:
+    async def call(i):
+        return func(query=f"query {i}", max_results=50)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    return time.perf_counter() - start
+
+
+async def run_pooled(func, calls: int, workers: WorkerPool) -> float:
+    tool = workers.wrap(func)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(tool(query=f"query {i}", max_results=50) for i in range(calls))
+    )
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    with FakeYoutubeAPI(delay=args.latency) as api:
+        workers = WorkerPool(max_workers=args.workers)
+
+        blocking = asyncio.run(
+            run_blocking(fake_youtube_tool(api.endpoint).search_videos, args.calls)
+        )
+        pooled = asyncio.run(
+            run_pooled(
+                fake_youtube_tool(api.endpoint).search_videos, args.calls, workers
+            )
+        )
+        workers.shutdown()
+
+    print(
+        f"{args.calls} concurrent search_videos calls, "
+        f"{args.latency * 1000:.0f} ms latency"
+    )
+    print(f"  on event loop : {blocking * 1000:8.1f} ms")
+    print(f"  worker pool   : {pooled * 1000:8.1f} ms ({args.workers} workers)")
+    print(f"  speedup       : {blocking / pooled:8.1f}x")
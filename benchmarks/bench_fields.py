@@ -0,0 +1,104 @@
+"""
+Bytes transferred and JSON parse time of list() responses with and without the
+fields= partial response masks built from the models.
+
+Responses come from the local fake API, which applies field masks like the real
+one. Payload sizes of the real API differ, but the fake items carry the same
+parts (thumbnails, localized text, tags...) so the ratio is representative.
+
+    python benchmarks/bench_fields.py --repeats 200
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.parse
+import urllib.request
+
+from fake_youtube_api import FakeYoutubeAPI
+
+from tools.google.field_masks import fields_mask, source_paths
+from tools.google.youtube_tools import (
+    CHANNEL_PARTS,
+    CHANNEL_SOURCES,
+    SEARCH_FIELDS,
+    UPLOAD_FIELDS,
+    VIDEO_PARTS,
+    VIDEO_SOURCES,
+    ChannelInfo,
+    VideoInfo,
+)
+
+IDS = ",".join(f"vi{i:09d}" for i in range(50))
+CHANNEL_IDS = ",".join(f"UC{i:022d}" for i in range(50))
+
+SCENARIOS = [
+    (
+        "videos.list, 50 IDs, all parts",
+        "videos",
+        {"part": ",".join(("id", *VIDEO_PARTS)), "id": IDS},
+        fields_mask(source_paths(VideoInfo, VIDEO_SOURCES)),
+    ),
+    (
+        "videos.list, 50 IDs, statistics only",
+        "videos",
+        {"part": "id,statistics", "id": IDS},
+        fields_mask(source_paths(VideoInfo, VIDEO_SOURCES, ["statistics"])),
+    ),
+    (
+        "channels.list, 50 IDs",
+        "channels",
+        {"part": ",".join(("id", *CHANNEL_PARTS)), "id": CHANNEL_IDS},
+        fields_mask(source_paths(ChannelInfo, CHANNEL_SOURCES)),
+    ),
+    (
+        "search.list, 50 videos",
+        "search",
+        {"part": "snippet", "type": "video", "q": "bench", "maxResults": 50},
+        SEARCH_FIELDS["video"],
+    ),
+    (
+        "playlistItems.list, 50 uploads",
+        "playlistItems",
+        {"part": "snippet,contentDetails", "playlistId": "UUbench", "maxResults": 50},
+        UPLOAD_FIELDS,
+    ),
+]
+
+
+def fetch(endpoint: str, resource: str, params: dict) -> bytes:
+    url = f"{endpoint}{resource}?{urllib.parse.urlencode(params)}"
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+def parse_time(data: bytes, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        json.loads(data)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'':38} {'bytes':>18} {'parse us':>18}")
+    print(f"{'':38} {'full':>8} {'masked':>9} {'full':>8} {'masked':>9}")
+
+    with FakeYoutubeAPI() as api:
+        for label, resource, params, mask in SCENARIOS:
+            full = fetch(api.endpoint, resource, params)
+            masked = fetch(api.endpoint, resource, {**params, "fields": mask})
+            full_parse = parse_time(full, args.repeats)
+            masked_parse = parse_time(masked, args.repeats)
+
+            print(
+                f"{label:38} {len(full):8d} {len(masked):9d} "
+                f"{full_parse * 1e6:8.0f} {masked_parse * 1e6:9.0f}   "
+                f"{len(full) / len(masked):4.1f}x smaller"
+            )
@@ -0,0 +1,111 @@
+"""
+Build and serialization time of VideoResults from videos().list items, at
+result sizes from one page to a large fan-out or catalog export.
+
+Build variants:
+    per item       VideoInfo(**fields) for every item, as the tools used to
+    model_construct  VideoInfo.model_construct(**fields), skipping validation
+    bulk adapter   One TypeAdapter(list[VideoInfo]) call per page, as the
+                   tools do now
+
+Serialization variants:
+    model_dump_json  The default json output of the tools
+    columnar         render(format="columnar"), through orjson if installed
+                     and through json.dumps otherwise
+
+Large sizes cycle through a pool of distinct fake items, so memory stays
+bounded while every item is still built and serialized.
+
+    python benchmarks/bench_models.py --sizes 50,5000,500000 --repeats 5
+"""
+
+import argparse
+import statistics
+import time
+
+from fake_youtube_api import video_item
+
+from tools.google import rendering
+from tools.google.youtube_tools import VIDEO_LIST, VideoInfo, VideoResults, video_fields
+
+POOL_SIZE = 1000
+PAGE_SIZE = 50
+
+
+def build_per_item(items: list[dict]) -> list[VideoInfo]:
+    return [VideoInfo(**video_fields(item)) for item in items]
+
+
+def build_construct(items: list[dict]) -> list[VideoInfo]:
+    return [VideoInfo.model_construct(**video_fields(item)) for item in items]
+
+
+def build_bulk(items: list[dict]) -> list[VideoInfo]:
+    videos = []
+    for start in range(0, len(items), PAGE_SIZE):
+        page = items[start : start + PAGE_SIZE]
+        videos.extend(VIDEO_LIST.validate_python([video_fields(item) for item in page]))
+    return videos
+
+
+BUILDERS = [
+    ("per item", build_per_item),
+    ("model_construct", build_construct),
+    ("bulk adapter", build_bulk),
+]
+
+
+def timed(fn, repeats: int) -> tuple[float, object]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def render_columnar(results: VideoResults, use_orjson: bool) -> str:
+    saved = rendering.orjson
+    if not use_orjson:
+        rendering.orjson = None
+    try:
+        return rendering.render(results, "videos", "video_id", format="columnar")
+    finally:
+        rendering.orjson = saved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="50,5000,500000")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    pool = [video_item(f"vi{i:09d}", i) for i in range(POOL_SIZE)]
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        items = [pool[i % POOL_SIZE] for i in range(size)]
+        # Keep large sizes to a single run
+        repeats = max(1, min(args.repeats, 5_000_000 // (size * 100)))
+
+        print(f"\n{size} videos, median of {repeats}")
+        print(f"  {'build':<32} {'ms':>9} {'us/item':>9}")
+        videos = None
+        for label, builder in BUILDERS:
+            elapsed, built = timed(lambda: builder(items), repeats)
+            print(f"  {label:<32} {elapsed * 1000:9.1f} {elapsed / size * 1e6:9.2f}")
+            if builder is build_bulk:
+                videos = built
+
+        results = VideoResults(total_results=size, videos=videos)
+        print(f"  {'serialize':<32} {'ms':>9} {'us/item':>9}")
+        serializers = [
+            ("model_dump_json", results.model_dump_json),
+            ("columnar, json.dumps", lambda: render_columnar(results, False)),
+        ]
+        if rendering.orjson is not None:
+            serializers.append(
+                ("columnar, orjson", lambda: render_columnar(results, True))
+            )
+        for label, serializer in serializers:
+            elapsed, _ = timed(serializer, repeats)
+            print(f"  {label:<32} {elapsed * 1000:9.1f} {elapsed / size * 1e6:9.2f}")
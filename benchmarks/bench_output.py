@@ -0,0 +1,69 @@
+"""
+Size and serialization time of tool results in the available output formats,
+compared with the full model_dump_json output.
+
+Results are built from fake API items, like a search_videos call with enrich.
+
+    python benchmarks/bench_output.py --items 50 --repeats 200
+"""
+
+import argparse
+import statistics
+import time
+
+from fake_youtube_api import video_item
+
+from tools.google.rendering import render
+from tools.google.youtube_tools import VIDEO_LIST, VideoResults, video_fields
+
+VARIANTS = [
+    ("model_dump_json (current)", {}),
+    ("exclude_none", {"exclude_none": True}),
+    ("descriptions cut at 200", {"max_description_chars": 200}),
+    (
+        "5 fields",
+        {"fields": ["video_title", "published_at", "duration", "view_count"]},
+    ),
+    ("columnar", {"format": "columnar", "max_description_chars": 200}),
+    ("tsv", {"format": "tsv", "max_description_chars": 200}),
+    (
+        "tsv, 5 fields",
+        {
+            "format": "tsv",
+            "fields": ["video_title", "published_at", "duration", "view_count"],
+        },
+    ),
+]
+
+
+def measure(results: VideoResults, options: dict, repeats: int) -> tuple[int, float]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = render(results, "videos", "video_id", **options)
+        timings.append(time.perf_counter() - start)
+
+    return len(output.encode("utf-8")), statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    results = VideoResults(
+        total_results=args.items,
+        videos=VIDEO_LIST.validate_python(
+            [video_fields(video_item(f"vi{i:09d}", i)) for i in range(args.items)]
+        ),
+    )
+
+    baseline_size, _ = measure(results, {}, 1)
+    print(f"{args.items} videos")
+    print(f"{'':28} {'bytes':>9} {'vs current':>11} {'time us':>9}")
+    for label, options in VARIANTS:
+        size, seconds = measure(results, options, args.repeats)
+        print(
+            f"{label:28} {size:9d} {size / baseline_size:10.0%} {seconds * 1e6:9.0f}"
+        )
@@ -0,0 +1,79 @@
+"""
+Startup benchmark: time from building the Youtube service to the first tool call.
+
+Compares building the service from the discovery document downloaded on every
+start (static_discovery=False) with building it from the cached document.
+The first call is answered by a mocked HTTP transport so only startup cost is
+measured.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so imports and discovery parsing are measured cold.
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.http import HttpMockSequence
+from tools.google.google_apis import get_discovery_document
+
+if sys.argv[1] == "network":
+    service = build("youtube", "v3", developerKey="bench", static_discovery=False)
+else:
+    service = build_from_document(
+        get_discovery_document("youtube", "v3"), developerKey="bench"
+    )
+built = time.perf_counter()
+
+http = HttpMockSequence([({"status": "200"}, json.dumps({"items": []}))])
+service.videos().list(part="snippet", id="dQw4w9WgXcQ").execute(http=http)
+done = time.perf_counter()
+
+print(json.dumps({"build": built - start, "first_call": done - start}))
+"""
+
+
+def measure(mode: str, runs: int) -> dict:
+    builds, first_calls = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD, mode],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output)
+        builds.append(result["build"])
+        first_calls.append(result["first_call"])
+
+    return {
+        "build_ms": statistics.median(builds) * 1000,
+        "first_call_ms": statistics.median(first_calls) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode in ("network", "cached"):
+        try:
+            result = measure(mode, args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"{mode:>8}: failed\n{e.stderr}")
+            continue
+        print(
+            f"{mode:>8}: build {result['build_ms']:8.1f} ms   "
+            f"first tool call {result['first_call_ms']:8.1f} ms"
+        )
@@ -0,0 +1,264 @@
+"""
+Local fake of the Youtube Data API v3 list endpoints used by the benchmarks.
+
+Responses are synthetic but shaped like the real API, and every request can be
+delayed to simulate network latency.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TOTAL_RESULTS = 1000
+
+
+def _snippet(index: int, kind: str) -> dict:
+    return {
+        "publishedAt": f"2024-01-{index % 28 + 1:02d}T12:00:00Z",
+        "publishTime": f"2024-01-{index % 28 + 1:02d}T12:00:00Z",
+        "channelId": f"UC{index:022d}",
+        "channelTitle": f"Channel {index}",
+        "title": f"{kind.title()} {index}",
+        "description": f"Description of {kind} {index}. " * 20,
+        "tags": ["benchmark", kind, str(index)],
+        "thumbnails": {
+            size: {
+                "url": f"https://i.ytimg.com/vi/{index}/{size}.jpg",
+                "width": 480,
+                "height": 360,
+            }
+            for size in ("default", "medium", "high", "standard", "maxres")
+        },
+        "localized": {
+            "title": f"{kind.title()} {index}",
+            "description": f"Description of {kind} {index}. " * 20,
+        },
+        "liveBroadcastContent": "none",
+    }
+
+
+def video_item(video_id: str, index: int = 0) -> dict:
+    return {
+        "kind": "youtube#video",
+        "etag": "etag",
+        "id": video_id,
+        "snippet": {**_snippet(index, "video"), "categoryId": "22"},
+        "contentDetails": {
+            "duration": f"PT{index % 60}M{index % 60}S",
+            "dimension": "2d",
+            "definition": "hd",
+            "caption": "false",
+            "licensedContent": True,
+            "contentRating": {},
+            "projection": "rectangular",
+        },
+        "statistics": {
+            "viewCount": str(index * 1000),
+            "likeCount": str(index * 10),
+            "favoriteCount": "0",
+            "commentCount": str(index),
+        },
+        "topicDetails": {
+            "topicCategories": ["https://en.wikipedia.org/wiki/Technology"]
+        },
+        "paidProductPlacementDetails": {"hasPaidProductPlacement": False},
+    }
+
+
+def channel_item(channel_id: str, index: int = 0) -> dict:
+    return {
+        "kind": "youtube#channel",
+        "etag": "etag",
+        "id": channel_id,
+        "snippet": {**_snippet(index, "channel"), "country": "US"},
+        "statistics": {
+            "viewCount": str(index * 100000),
+            "subscriberCount": str(index * 100),
+            "hiddenSubscriberCount": False,
+            "videoCount": str(index),
+        },
+    }
+
+
+def parse_fields(mask: str) -> dict:
+    """
+    Parse a fields= partial response mask into a tree of selected keys.
+    """
+    tree, stack, key = {}, [], ""
+    node = tree
+    for char in mask + ",":
+        if char == "(":
+            stack.append(node)
+            node = node.setdefault(key.strip(), {})
+            key = ""
+        elif char in ",)":
+            if key.strip():
+                node.setdefault(key.strip(), {})
+            key = ""
+            if char == ")":
+                node = stack.pop()
+        else:
+            key += char
+    return tree
+
+
+def select_fields(value, tree: dict):
+    """
+    Apply a parsed field mask to a response, like the API does for fields=.
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [select_fields(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    selected = {}
+    for key, children in tree.items():
+        if key in value:
+            selected[key] = select_fields(value[key], children)
+    return selected
+
+
+class FakeYoutubeHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open, so clients that pool them are measured
+    # with keep-alive rather than a new connection per request. Without Nagle,
+    # the separately written headers and body don't wait for a delayed ACK.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        resource = url.path.rstrip("/").rsplit("/", 1)[-1]
+        time.sleep(self.delay)
+
+        if resource == "search":
+            body = self._search(params)
+        elif resource == "videos":
+            ids = params["id"].split(",")
+            body = {"items": [video_item(v, i) for i, v in enumerate(ids)]}
+            body["pageInfo"] = {"totalResults": len(ids), "resultsPerPage": len(ids)}
+        elif resource == "channels":
+            ids = params.get("id", "UC0000000000000000000000").split(",")
+            body = {"items": [channel_item(c, i) for i, c in enumerate(ids)]}
+            body["pageInfo"] = {"totalResults": len(ids), "resultsPerPage": len(ids)}
+        elif resource == "playlistItems":
+            body = self._playlist_items(params)
+        else:
+            self.send_error(404)
+            return
+
+        if params.get("fields"):
+            body = select_fields(body, parse_fields(params["fields"]))
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _page(self, params: dict) -> tuple[int, int, dict]:
+        start = int(params.get("pageToken") or 0)
+        count = min(int(params.get("maxResults", 5)), TOTAL_RESULTS - start)
+        body = {"pageInfo": {"totalResults": TOTAL_RESULTS, "resultsPerPage": count}}
+        if start + count < TOTAL_RESULTS:
+            body["nextPageToken"] = str(start + count)
+        return start, count, body
+
+    def _search(self, params: dict) -> dict:
+        start, count, body = self._page(params)
+        kind = params.get("type", "video")
+        id_key = {"video": "videoId", "channel": "channelId"}.get(kind, "playlistId")
+        # Different publish time windows return different results
+        window = params.get("publishedAfter", "") + params.get("publishedBefore", "")
+        offset = zlib.crc32(window.encode()) % 10000 * TOTAL_RESULTS if window else 0
+        body["items"] = [
+            {
+                "kind": "youtube#searchResult",
+                "id": {"kind": f"youtube#{kind}", id_key: f"{kind[:2]}{i:09d}"},
+                "snippet": _snippet(i, kind),
+            }
+            for i in range(offset + start, offset + start + count)
+        ]
+        return body
+
+    def _playlist_items(self, params: dict) -> dict:
+        start, count, body = self._page(params)
+        body["items"] = [
+            {
+                "kind": "youtube#playlistItem",
+                "id": f"item{i}",
+                "snippet": {
+                    **_snippet(TOTAL_RESULTS - i, "video"),
+                    "playlistId": params.get("playlistId"),
+                    "position": i,
+                    "resourceId": {"kind": "youtube#video", "videoId": f"vi{i:09d}"},
+                },
+                "contentDetails": {"videoId": f"vi{i:09d}"},
+            }
+            for i in range(start, start + count)
+        ]
+        return body
+
+
+class FakeYoutubeAPI:
+    """
+    Runs the fake API on a local port in a background thread.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        handler = type("Handler", (FakeYoutubeHandler,), {"delay": delay})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}/youtube/v3/"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fake_youtube_tool(endpoint: str, **kwargs):
+    """
+    Build a YoutubeTool that talks to the fake API instead of Google.
+
+    The rate limit is lifted unless given, so benchmarks measure the code
+    rather than the limiter. Other keyword arguments go to YoutubeTool.
+    """
+    from googleapiclient.discovery import build_from_document
+    from tools.google import YoutubeTool
+    from tools.google.google_apis import get_discovery_document
+
+    class FakeYoutubeTool(YoutubeTool):
+        def _init_youtube_service(self):
+            service = build_from_document(
+                get_discovery_document(self.API_NAME, self.API_VERSION),
+                developerKey="fake",
+                client_options={"api_endpoint": endpoint},
+            )
+            self._init_pool({"fake": service})
+            return self.service
+
+    kwargs.setdefault("requests_per_second", 100000)
+    return FakeYoutubeTool(
+        "fake_client_secret.json", cache_dir=tempfile.mkdtemp(), **kwargs
+    )
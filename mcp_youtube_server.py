@@ -1,9 +1,16 @@
+import argparse
+import json
+import os
 import re
-from typing import Any
-import httpx
-from mcp.server.fastmcp import FastMCP
-from youtube_transcript_api import YouTubeTranscriptApi
-from tools.google import YoutubeTool, extract_video_id
+from mcp.server.fastmcp import Context, FastMCP
+from tools.google import (
+    HostLimiter,
+    TranscriptStore,
+    WorkerPool,
+    YoutubeTool,
+    download_many,
+    extract_video_id,
+)
 
 mcp = FastMCP(
     "Youtube MCP Server",
@@ -15,36 +22,61 @@ mcp = FastMCP(
     ],
 )
 
-yt_tool = YoutubeTool(r"/Users/adityatrivedi/Desktop/Developer/Youtube-MCP-Server/client_secret.json")
+yt_tool = YoutubeTool(
+    r"/Users/adityatrivedi/Desktop/Developer/Youtube-MCP-Server/client_secret.json",
+    # Extra API keys, e.g. from other projects, are pooled with the OAuth token
+    api_keys=[key for key in os.environ.get("YOUTUBE_API_KEYS", "").split(",") if key],
+)
+transcript_store = TranscriptStore(os.path.join("cache_files", "transcripts"))
+workers = WorkerPool(max_workers=16)
+# Politeness limits for transcript downloads, shared by all batches
+transcript_hosts = HostLimiter(max_concurrent=4, min_interval=0.2)
 
 mcp.add_tool(
-    yt_tool.get_video_info,
+    workers.wrap(yt_tool.get_video_info),
     name="Get Video Info",
     description="Get video information from Youtube",
 )
 mcp.add_tool(
-    yt_tool.get_channel_info,
+    workers.wrap(yt_tool.get_channel_info),
     name="Get Channel Info",
     description="Get channel information from Youtube",
 )
 mcp.add_tool(
-    yt_tool.search_channel,
+    workers.wrap(yt_tool.search_channel),
     name="Search Channel",
     description="Search for Youtube Channels",
 )
 mcp.add_tool(
-    yt_tool.search_playlist,
+    workers.wrap(yt_tool.search_playlist),
     name="Search Playlist",
     description="Search for Youtube Playlists",
 )
 mcp.add_tool(
-    yt_tool.search_videos, name="Search Videos", description="Search for Youtube Videos"
+    workers.wrap(yt_tool.search_videos),
+    name="Search Videos",
+    description="Search for Youtube Videos",
 )
 mcp.add_tool(
-    yt_tool.get_channel_videos,
+    workers.wrap(yt_tool.get_channel_videos),
     name="Get Channel Videos",
     description="Get videos uploaded by Youtube Channel",
 )
+mcp.add_tool(
+    workers.wrap(yt_tool.get_quota_status),
+    name="Get Quota Status",
+    description="Get today's Youtube Data API quota usage and remaining budget",
+)
+mcp.add_tool(
+    workers.wrap(yt_tool.query_catalog),
+    name="Query Local Catalog",
+    description="Query videos, channels and playlists fetched before, with SQL",
+)
+mcp.add_tool(
+    workers.wrap(yt_tool.get_request_stats),
+    name="Get Request Stats",
+    description="Get request batching and coalescing metrics",
+)
 mcp.add_tool(
     extract_video_id,
     name="Extract Video Id",
@@ -52,31 +84,191 @@ mcp.add_tool(
 )
 
 
-@mcp.tool(
-    name="Download Youtube Video Transcript",
-    description="Download the transcript of a Youtube Video",
-)
-def download_transcript(video_id: str, include_timestamp: bool = False) -> str:
+def fetch_transcript(video_id: str, language: str) -> list[dict]:
+    """
+    Get the transcript segments of a Youtube Video, from the local transcript
+    store if it was downloaded before.
+    """
+    transcript = transcript_store.get(video_id, language)
+    if transcript is None:
+        # Imported on first download to keep server startup fast
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+        transcript_store.put(video_id, language, transcript)
+
+    return transcript
+
+
+def format_transcript(transcript: list[dict], include_timestamp: bool) -> str:
+    if include_timestamp:
+        return str(transcript)
+
+    return "\n".join([entry["text"] for entry in transcript])
+
+
+def download_transcript(
+    video_id: str, include_timestamp: bool = False, language: str = "en"
+) -> str:
     """
     Download the transcript for a Youtube Video.
+    Transcripts that were downloaded before are served from the local transcript store.
     """
+    video_id = extract_video_id(video_id)
     if not video_id:
-        return "Invalid Youtube Video ID or URL".format
+        return "Invalid Youtube Video ID or URL"
 
     try:
-        if include_timestamp:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            transcript_text = str(transcript)
+        transcript = fetch_transcript(video_id, language)
+        return format_transcript(transcript, include_timestamp)
+
+    except Exception as e:
+        return f"Error Downloading Transcript: {str(e)}"
+
+
+async def download_transcripts(
+    video_ids: str | list[str],
+    include_timestamp: bool = False,
+    language: str = "en",
+    parallelism: int = 8,
+    ctx: Context = None,
+) -> str:
+    """
+    Download the transcripts of many Youtube Videos concurrently.
+    The status of each video (ok with the transcript size, or the error) is
+    streamed back as a log message as soon as it completes; the transcripts
+    themselves are only sent in the result. A video whose transcript cannot be
+    downloaded gets an error entry and does not abort the batch.
 
+    Args:
+        video_ids: Youtube Video IDs or URLs, as a list or separated by commas
+            or whitespace.
+        include_timestamp: Include the timing of every transcript segment.
+        language: Transcript language code.
+        parallelism: Maximum number of transcripts downloaded at the same time.
+    """
+    if isinstance(video_ids, str):
+        video_ids = re.split(r"[\s,]+", video_ids)
+
+    results = []
+    unique_ids = {}
+    for token in video_ids:
+        token = token.strip()
+        if not token:
+            continue
+
+        video_id = extract_video_id(token)
+        if video_id:
+            unique_ids.setdefault(video_id, None)
         else:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            transcript_text = "\n".join([entry["text"] for entry in transcript])
+            results.append(
+                {"video_id": token, "error": "Invalid Youtube Video ID or URL"}
+            )
 
-        return transcript_text
+    total = len(results) + len(unique_ids)
 
-    except Exception as e:
-        return f"Error Downloading Transcript: {str(e)}"
+    async def report(result):
+        results.append(result)
+        if ctx is not None:
+            await ctx.report_progress(len(results), total)
+            if "error" in result:
+                status = {"status": "error", "error": result["error"]}
+            else:
+                status = {"status": "ok", "chars": len(result["transcript"])}
+            await ctx.info(json.dumps({"video_id": result["video_id"], **status}))
+
+    # Stored transcripts need no download and skip the politeness limits
+    stored = await workers.run(
+        lambda: {
+            video_id: transcript_store.get(video_id, language)
+            for video_id in unique_ids
+        }
+    )
+    for video_id, transcript in stored.items():
+        if transcript is not None:
+            await report(
+                {
+                    "video_id": video_id,
+                    "transcript": format_transcript(transcript, include_timestamp),
+                }
+            )
+
+    async def fetch(video_id):
+        transcript = await workers.run(fetch_transcript, video_id, language)
+        return format_transcript(transcript, include_timestamp)
+
+    missing = [
+        video_id for video_id, transcript in stored.items() if transcript is None
+    ]
+    async for result in download_many(
+        missing,
+        fetch,
+        parallelism=max(1, min(parallelism, workers.max_workers)),
+        limiter=transcript_hosts,
+    ):
+        await report(result)
+
+    return json.dumps({"transcripts": results})
+
+
+mcp.add_tool(
+    workers.wrap(download_transcript),
+    name="Download Youtube Video Transcript",
+    description="Download the transcript of a Youtube Video",
+)
+mcp.add_tool(
+    download_transcripts,
+    name="Download Transcripts",
+    description="Download the transcripts of many Youtube Videos in parallel",
+)
+
+
+def create_http_app():
+    """
+    Build the streamable HTTP app of one server worker process.
+
+    Sessions are stateless because consecutive requests of a client may reach
+    different workers. The workers share the entity cache, quota ledger,
+    credential cool-downs, OAuth tokens and transcript store through the
+    SQLite databases and files in cache_files/ and token_files/.
+    """
+    mcp.settings.stateless_http = True
+    return mcp.streamable_http_app()
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    parser = argparse.ArgumentParser(description="Youtube MCP Server")
+    parser.add_argument(
+        "--transport", choices=["stdio", "sse", "streamable-http"], default="stdio"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Server processes behind the port, streamable-http only",
+    )
+    args = parser.parse_args()
+
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+
+    elif args.workers == 1:
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        mcp.run(transport=args.transport)
+
+    else:
+        if args.transport != "streamable-http":
+            parser.error("SSE sessions are bound to one process, use streamable-http")
+
+        import uvicorn
+
+        uvicorn.run(
+            "mcp_youtube_server:create_http_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+        )
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from tools.google.async_client import AsyncYoutubeClient, YoutubeApiError
+
+
+class FakeCredentials:
+    """
+    OAuth credentials that expire until refreshed, counting refreshes.
+    """
+
+    def __init__(self) -> None:
+        self.valid = False
+        self.refreshes = 0
+
+    def refresh(self, request) -> None:
+        self.refreshes += 1
+        self.valid = True
+
+    def apply(self, headers: dict) -> None:
+        headers["authorization"] = "Bearer token"
+
+
+def client(handler, **kwargs) -> AsyncYoutubeClient:
+    return AsyncYoutubeClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_requires_credentials_or_api_key():
+    with pytest.raises(ValueError):
+        AsyncYoutubeClient()
+
+
+def test_list_sends_params_and_api_key():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"items": [{"id": "dQw4w9WgXcQ"}]})
+
+    async def main():
+        async with client(handler, api_key="key") as youtube:
+            return await youtube.videos_list(
+                part="snippet", id="dQw4w9WgXcQ", pageToken=None
+            )
+
+    assert asyncio.run(main()) == {"items": [{"id": "dQw4w9WgXcQ"}]}
+    (request,) = requests
+    assert request.url.path == "/youtube/v3/videos"
+    assert dict(request.url.params) == {
+        "part": "snippet",
+        "id": "dQw4w9WgXcQ",
+        "key": "key",
+    }
+
+
+def test_error_response_raises_youtube_api_error():
+    error = {
+        "error": {
+            "message": "The request cannot be completed.",
+            "errors": [{"reason": "quotaExceeded"}],
+        }
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(403, content=json.dumps(error))
+
+    async def main():
+        async with client(handler, api_key="key") as youtube:
+            await youtube.search_list(part="snippet", q="python")
+
+    with pytest.raises(YoutubeApiError) as e:
+        asyncio.run(main())
+    assert (e.value.status, e.value.reason) == (403, "quotaExceeded")
+
+
+def test_error_response_that_is_not_json():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(502, text="Bad Gateway")
+
+    async def main():
+        async with client(handler, api_key="key") as youtube:
+            await youtube.channels_list(part="snippet", id="UC0")
+
+    with pytest.raises(YoutubeApiError) as e:
+        asyncio.run(main())
+    assert (e.value.status, e.value.reason, e.value.message) == (
+        502,
+        "",
+        "Bad Gateway",
+    )
+
+
+def test_expired_credentials_are_refreshed_once():
+    credentials = FakeCredentials()
+    headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers.append(request.headers.get("authorization"))
+        assert "key" not in request.url.params
+        return httpx.Response(200, json={"items": []})
+
+    async def main():
+        async with client(handler, credentials=credentials) as youtube:
+            await asyncio.gather(
+                *(youtube.playlist_items_list(part="id") for _ in range(10))
+            )
+
+    asyncio.run(main())
+    assert credentials.refreshes == 1
+    assert headers == ["Bearer token"] * 10
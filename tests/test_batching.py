@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tools.google.batching import BatchLoader
+
+
+class RecordingBatch:
+    """
+    Batch function that loads every key as its upper case and records the
+    batches it was called with.
+    """
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, group, keys: list[str], tool: str) -> dict:
+        with self.lock:
+            self.batches.append((group, keys, tool))
+        if self.error is not None:
+            raise self.error
+        return {key: key.upper() for key in keys if key != "missing"}
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_full_batch_is_dispatched_without_waiting(executor):
+    batch_fn = RecordingBatch()
+    # The window never closes during the test, only a full batch is sent
+    loader = BatchLoader(batch_fn, executor, window=60, max_batch_size=3)
+
+    futures = loader.submit("videos", ["a", "b", "c", "d"], "get_video_info")
+
+    assert [futures[key].result(timeout=5) for key in "abc"] == ["A", "B", "C"]
+    assert batch_fn.batches == [("videos", ["a", "b", "c"], "get_video_info")]
+    assert not futures["d"].done()
+
+
+def test_window_dispatches_partial_batches(executor):
+    batch_fn = RecordingBatch()
+    loader = BatchLoader(batch_fn, executor, window=0.01)
+
+    assert loader.load_many("videos", ["a", "missing"], "get_video_info") == {
+        "a": "A",
+        "missing": None,
+    }
+
+
+def test_keys_in_an_open_batch_are_shared(executor):
+    batch_fn = RecordingBatch()
+    loader = BatchLoader(batch_fn, executor, window=60, max_batch_size=3)
+
+    first = loader.submit("videos", ["a", "b"], "search_videos")
+    second = loader.submit("videos", ["b", "c"], "get_video_info")
+
+    assert first["b"] is second["b"]
+    assert second["b"].result(timeout=5) == "B"
+    assert batch_fn.batches == [("videos", ["a", "b", "c"], "search_videos")]
+    assert loader.stats()["shared_keys"] == 1
+
+
+def test_groups_are_batched_separately(executor):
+    batch_fn = RecordingBatch()
+    loader = BatchLoader(batch_fn, executor, window=0.01)
+
+    loader.load_many("videos", ["a"], "get_video_info")
+    loader.load_many("channels", ["a"], "get_channel_info")
+
+    assert sorted(group for group, _, _ in batch_fn.batches) == [
+        "channels",
+        "videos",
+    ]
+
+
+def test_errors_reach_every_future(executor):
+    error = RuntimeError("API unavailable")
+    loader = BatchLoader(RecordingBatch(error), executor, window=60, max_batch_size=2)
+
+    first = loader.submit("videos", ["a"], "get_video_info")
+    second = loader.submit("videos", ["b"], "search_videos")
+
+    for future in (first["a"], second["b"]):
+        with pytest.raises(RuntimeError, match="API unavailable"):
+            future.result(timeout=5)
+
+
+def test_stats_histogram(executor):
+    loader = BatchLoader(RecordingBatch(), executor, window=0.01, max_batch_size=7)
+
+    loader.load_many("videos", ["a"], "get_video_info")
+    loader.load_many("videos", list("abcdefg"), "get_video_info")
+    loader.load_many("videos", list("abcdefghij"), "get_video_info")
+
+    stats = loader.stats()
+    assert stats["batches"] == 4
+    assert stats["keys"] == 1 + 7 + 10
+    assert stats["average_batch_size"] == 18 / 4
+    assert stats["batch_size_histogram"] == {
+        "<=1": 1,
+        "<=5": 1,
+        "<=10": 2,
+        "<=25": 0,
+        "<=50": 0,
+    }
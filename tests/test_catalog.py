@@ -0,0 +1,77 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from tools.google import catalog as catalog_module
+from tools.google.catalog import Catalog
+from tools.google.youtube_tools import CATALOG_TABLES, VideoInfo
+
+
+def video(**fields) -> VideoInfo:
+    defaults = {
+        "channel_id": "UC0",
+        "channel_title": "Channel",
+        "video_id": "dQw4w9WgXcQ",
+        "video_title": "Video",
+        "description": "",
+        "published_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+    return VideoInfo(**{**defaults, **fields})
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"), CATALOG_TABLES)
+    yield catalog
+    catalog.close()
+
+
+def test_search_results_keep_stored_statistics(catalog):
+    catalog.add([video(view_count=1000, duration_s=60, tags=["python"])])
+    catalog.flush()
+    catalog.add([video(video_title="Renamed")])
+
+    result = catalog.query(
+        "SELECT video_title, view_count, duration_s, tags FROM videos"
+    )
+    assert result["rows"] == [["Renamed", 1000, 60, '["python"]']]
+
+
+def test_query_limits_rows(catalog):
+    catalog.add([video(video_id=f"video{index:06d}") for index in range(5)])
+
+    result = catalog.query("SELECT video_id FROM videos ORDER BY video_id", 3)
+    assert result["columns"] == ["video_id"]
+    assert len(result["rows"]) == 3 and result["truncated"]
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "DELETE FROM videos",
+        "UPDATE videos SET view_count = 0",
+        "INSERT INTO videos (video_id, updated_at) VALUES ('x', 0)",
+        "DROP TABLE videos",
+        "CREATE TABLE notes (text TEXT)",
+        "PRAGMA table_info(videos)",
+        "SELECT * FROM pragma_table_info('videos')",
+        "ATTACH DATABASE ':memory:' AS other",
+    ],
+)
+def test_query_rejects_anything_but_reads(catalog, sql):
+    catalog.add([video(view_count=1000)])
+
+    with pytest.raises(sqlite3.DatabaseError):
+        catalog.query(sql)
+    assert catalog.query("SELECT view_count FROM videos")["rows"] == [[1000]]
+
+
+def test_query_interrupts_slow_queries(catalog, monkeypatch):
+    monkeypatch.setattr(catalog_module, "QUERY_TIMEOUT", 0.1)
+
+    with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+        catalog.query(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+            "SELECT count(*) FROM n"
+        )
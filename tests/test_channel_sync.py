@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from tools.google.quota import QuotaExceededError
+from tools.google.youtube_tools import YoutubeTool
+
+CHANNEL_ID = "UC0000000000000000000000"
+
+
+class FakeUploads:
+    """
+    Uploads playlist of one channel, newest first, served in pages like
+    playlistItems().list. Setting quota_after makes calls fail once that
+    many pages were served.
+    """
+
+    def __init__(self) -> None:
+        self.videos = []
+        self.quota_after = None
+        self.calls = 0
+
+    def upload(self, count: int) -> None:
+        for _ in range(count):
+            index = len(self.videos) + 1
+            self.videos.insert(0, index)
+
+    def list(self, resource, tool, maxResults, pageToken=None, **params) -> dict:
+        if self.quota_after is not None and self.calls >= self.quota_after:
+            raise QuotaExceededError("out of quota")
+        self.calls += 1
+
+        start = int(pageToken or 0)
+        items = [
+            {
+                "snippet": {
+                    "channelId": CHANNEL_ID,
+                    "channelTitle": "Channel",
+                    "title": f"Video {index}",
+                    "publishedAt": f"2024-01-01T{index // 60:02d}:{index % 60:02d}:00Z",
+                    "resourceId": {"videoId": f"v{index}"},
+                },
+            }
+            for index in self.videos[start : start + maxResults]
+        ]
+        response = {"items": items, "pageInfo": {"totalResults": len(self.videos)}}
+        if start + maxResults < len(self.videos):
+            response["nextPageToken"] = str(start + maxResults)
+        return response
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    tool = YoutubeTool("client_secret.json", cache_dir=str(tmp_path))
+    fake = FakeUploads()
+    monkeypatch.setattr(tool, "_list", fake.list)
+    monkeypatch.setattr(
+        tool, "_resolve_channel_id", lambda channel_id, tool: channel_id
+    )
+    monkeypatch.setattr(tool.catalog, "add", lambda models: None)
+
+    def sync(max_results: int = 50) -> list[str]:
+        result = tool.get_channel_videos(
+            CHANNEL_ID, max_results=max_results, since_last_sync=True
+        )
+        return [video["video_id"] for video in json.loads(result)["videos"]]
+
+    fake.sync = sync
+    return fake
+
+
+def test_sync_returns_only_new_uploads(uploads):
+    uploads.upload(5)
+    assert uploads.sync() == ["v5", "v4", "v3", "v2", "v1"]
+
+    uploads.upload(2)
+    assert uploads.sync() == ["v7", "v6"]
+    assert uploads.sync() == []
+
+
+def test_sync_stopped_by_max_results_fills_the_gap(uploads):
+    uploads.upload(5)
+    uploads.sync()
+
+    uploads.upload(7)
+    assert uploads.sync(max_results=3) == ["v12", "v11", "v10"]
+    assert uploads.sync() == ["v9", "v8", "v7", "v6"]
+    assert uploads.sync() == []
+
+
+def test_sync_gaps_across_several_partial_syncs(uploads):
+    uploads.upload(3)
+    uploads.sync()
+
+    uploads.upload(6)
+    assert uploads.sync(max_results=2) == ["v9", "v8"]
+    uploads.upload(3)
+    assert uploads.sync(max_results=2) == ["v12", "v11"]
+    assert uploads.sync(max_results=2) == ["v10", "v7"]
+    assert uploads.sync() == ["v6", "v5", "v4"]
+
+    uploads.upload(1)
+    assert uploads.sync() == ["v13"]
+
+
+def test_sync_stopped_by_quota_fills_the_gap(uploads):
+    uploads.upload(60)
+    uploads.quota_after = 1
+    assert len(uploads.sync(max_results=100)) == 50
+
+    uploads.quota_after = None
+    assert uploads.sync(max_results=100) == [f"v{index}" for index in range(10, 0, -1)]
+    assert uploads.sync() == []
@@ -0,0 +1,69 @@
+import base64
+import json
+
+import pytest
+
+from tools.google.youtube_tools import decode_cursor, encode_cursor
+
+PARAMS = {
+    "q": "python",
+    "type": "video",
+    "order": "date",
+    "publishedAfter": None,
+    "publishedBefore": None,
+}
+
+
+def raw_cursor(payload) -> str:
+    data = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def test_round_trip():
+    query = {"q": "python", "type": "video", "order": "date"}
+    cursor = encode_cursor("search_videos", query, "CAUQAA")
+
+    assert decode_cursor("search_videos", cursor, PARAMS) == (query, "CAUQAA")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        raw_cursor([1, 2]),
+        raw_cursor("query"),
+        raw_cursor({"query": {"q": "x", "type": "video"}, "page_token": "t"}),
+        raw_cursor({"tool": "search_videos", "page_token": "t"}),
+        raw_cursor({"tool": "search_channel", "query": {}, "page_token": "t"}),
+        raw_cursor({"tool": "search_videos", "query": "q", "page_token": "t"}),
+        raw_cursor({"tool": "search_videos", "query": {"type": "video"}}),
+        raw_cursor({"tool": "search_videos", "query": {"q": "x"}, "page_token": "t"}),
+        raw_cursor(
+            {
+                "tool": "search_videos",
+                "query": {"q": "x", "type": "channel"},
+                "page_token": "t",
+            }
+        ),
+        raw_cursor(
+            {
+                "tool": "search_videos",
+                "query": {"q": "x", "type": "video", "key": "stolen"},
+                "page_token": "t",
+            }
+        ),
+        raw_cursor(
+            {
+                "tool": "search_videos",
+                "query": {"q": ["x"], "type": "video"},
+                "page_token": "t",
+            }
+        ),
+        raw_cursor(
+            {"tool": "search_videos", "query": {"type": "video"}, "page_token": 5}
+        ),
+    ],
+)
+def test_invalid_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor("search_videos", cursor, PARAMS)
@@ -0,0 +1,250 @@
+import json
+import threading
+from datetime import timedelta
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from tools.google.quota import QuotaExceededError
+from tools.google.youtube_tools import (
+    MIN_FAN_OUT_WINDOW,
+    YOUTUBE_LAUNCH,
+    YoutubeTool,
+    parse_date_range,
+)
+
+
+class FakeSearch:
+    """
+    search.list with ten results per page and two pages per window, failing
+    with the given error once calls_before_error calls were served.
+    """
+
+    def __init__(self, error: Exception, calls_before_error: int) -> None:
+        self.error = error
+        self.calls_before_error = calls_before_error
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def list(self, resource, tool, publishedAfter, pageToken=None, **params) -> dict:
+        with self.lock:
+            if self.calls >= self.calls_before_error:
+                raise self.error
+            self.calls += 1
+            call = self.calls
+
+        items = [
+            {
+                "id": {"videoId": f"v{call:03d}{index}"},
+                "snippet": {
+                    "channelId": "UC0",
+                    "channelTitle": "Channel",
+                    "title": f"Video {call}.{index}",
+                    "description": "",
+                    "publishedAt": publishedAfter,
+                },
+            }
+            for index in range(10)
+        ]
+        response = {"items": items, "pageInfo": {"totalResults": 20}}
+        if pageToken is None:
+            response["nextPageToken"] = "2"
+        return response
+
+
+@pytest.fixture
+def tool(tmp_path):
+    tool = YoutubeTool("client_secret.json", cache_dir=str(tmp_path))
+    tool.catalog.add = lambda models: None
+    return tool
+
+
+DAY = timedelta(days=1)
+
+
+def server_error() -> HttpError:
+    return HttpError(httplib2.Response({"status": 500}), b"{}")
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        server_error(),
+        QuotaExceededError("out of quota"),
+        httplib2.ServerNotFoundError("no route"),
+        ConnectionResetError("reset"),
+    ],
+)
+def test_fan_out_keeps_paid_pages_on_error(tool, monkeypatch, error):
+    monkeypatch.setattr(tool, "_list", FakeSearch(error, 1).list)
+
+    result = json.loads(tool.search_videos("python", fan_out=True, max_results=100))
+    assert len(result["videos"]) == 10
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        server_error(),
+        httplib2.ServerNotFoundError("no route"),
+        ConnectionResetError("reset"),
+    ],
+)
+def test_fan_out_raises_when_nothing_was_found(tool, monkeypatch, error):
+    monkeypatch.setattr(tool, "_list", FakeSearch(error, 0).list)
+
+    with pytest.raises(type(error)):
+        tool.search_videos("python", fan_out=True, max_results=100)
+
+
+def test_fan_out_without_quota_returns_an_error(tool, monkeypatch):
+    error = QuotaExceededError("out of quota")
+    monkeypatch.setattr(tool, "_list", FakeSearch(error, 0).list)
+
+    result = tool.search_videos("python", fan_out=True, max_results=100)
+    assert result == "Error: out of quota"
+
+
+@pytest.mark.parametrize(
+    "published_after, published_before, message",
+    [
+        ("yesterday", None, "published_after must be an RFC 3339 timestamp"),
+        (None, "2024-13-01T00:00:00Z", "published_before must be an RFC 3339"),
+        ("2024-02-01T00:00:00Z", "2024-01-01T00:00:00Z", "must be before"),
+    ],
+)
+def test_fan_out_rejects_invalid_dates(
+    tool, published_after, published_before, message
+):
+    result = tool.search_videos(
+        "python",
+        fan_out=True,
+        published_after=published_after,
+        published_before=published_before,
+    )
+    assert result.startswith("Error: ") and message in result
+
+
+class FakeSplitSearch:
+    """
+    search.list that reports total_results(window length) results per window,
+    and videos.list that returns statistics for any ID.
+    """
+
+    def __init__(self, total_results=lambda length: 1000 if length > DAY else 1):
+        self.total_results = total_results
+        self.lock = threading.Lock()
+        self.search_calls = 0
+        self.windows = []
+
+    def list(self, resource, tool, **params) -> dict:
+        if resource == "videos":
+            return {
+                "items": [
+                    {
+                        "id": video_id,
+                        "snippet": {
+                            "channelId": "UC0",
+                            "channelTitle": "Channel",
+                            "title": video_id,
+                            "publishedAt": "2024-01-01T00:00:00Z",
+                        },
+                        "statistics": {"viewCount": "5"},
+                    }
+                    for video_id in params["id"].split(",")
+                ]
+            }
+
+        start, end = parse_date_range(
+            params["publishedAfter"], params["publishedBefore"]
+        )
+        with self.lock:
+            self.search_calls += 1
+            self.windows.append((start, end))
+        return {
+            "items": [
+                {
+                    "id": {"videoId": params["publishedAfter"]},
+                    "snippet": {
+                        "channelId": "UC0",
+                        "channelTitle": "Channel",
+                        "title": "Video",
+                        "description": "",
+                        "publishedAt": params["publishedAfter"],
+                    },
+                }
+            ],
+            "pageInfo": {"totalResults": self.total_results(end - start)},
+        }
+
+
+def test_fan_out_hydrates_windows_while_searching(tool, monkeypatch):
+    fake = FakeSplitSearch()
+    monkeypatch.setattr(tool, "_list", fake.list)
+    submit_entities = tool._submit_entities
+    searched_at_submit = []
+
+    def record_submit(*args):
+        searched_at_submit.append(fake.search_calls)
+        return submit_entities(*args)
+
+    monkeypatch.setattr(tool, "_submit_entities", record_submit)
+
+    result = json.loads(
+        tool.search_videos(
+            "python",
+            fan_out=True,
+            enrich=True,
+            published_after="2024-01-01T00:00:00Z",
+            published_before="2024-01-05T00:00:00Z",
+            max_results=100,
+        )
+    )
+
+    assert len(searched_at_submit) > 1
+    assert searched_at_submit[0] < fake.search_calls
+    assert [video["view_count"] for video in result["videos"]] == [5] * len(
+        result["videos"]
+    )
+
+
+def test_fan_out_splits_in_one_step(tool, monkeypatch):
+    fake = FakeSplitSearch(lambda length: 1200 if length > DAY else 1)
+    monkeypatch.setattr(tool, "_list", fake.list)
+
+    tool.search_videos(
+        "python",
+        fan_out=True,
+        published_after="2024-01-01T00:00:00Z",
+        published_before="2024-01-04T00:00:00Z",
+        max_results=100,
+    )
+
+    top, *windows = fake.windows
+    assert len(windows) == 3
+    windows.sort()
+    assert windows[0][0] == top[0] and windows[-1][1] == top[1]
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+
+
+def test_fan_out_never_splits_below_the_minimum_window(tool, monkeypatch):
+    fake = FakeSplitSearch(lambda length: 1000)
+    monkeypatch.setattr(tool, "_list", fake.list)
+
+    tool.search_videos(
+        "python",
+        fan_out=True,
+        published_after="2024-01-01T00:00:00Z",
+        published_before="2024-01-01T00:03:00Z",
+        max_results=100,
+    )
+
+    assert len(fake.windows) == 1 + 2
+    assert all(end - start >= MIN_FAN_OUT_WINDOW for start, end in fake.windows)
+
+
+def test_parse_date_range_defaults():
+    start, end = parse_date_range(None, "2024-01-01T00:00:00Z")
+    assert start == YOUTUBE_LAUNCH
+    assert end.isoformat() == "2024-01-01T00:00:00+00:00"
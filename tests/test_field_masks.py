@@ -0,0 +1,95 @@
+import pytest
+
+from tools.google.field_masks import field_reader, fields_mask, source_paths
+from tools.google.youtube_tools import (
+    SEARCH_SOURCES,
+    UPLOAD_SOURCES,
+    VIDEO_SOURCES,
+    VideoInfo,
+    upload_fields,
+    video_fields,
+    video_search_fields,
+)
+
+VIDEO_ITEM = {
+    "id": "dQw4w9WgXcQ",
+    "snippet": {
+        "channelId": "UC0",
+        "channelTitle": "Channel",
+        "title": "Video",
+        "publishedAt": "2024-01-01T00:00:00Z",
+        "tags": ["python"],
+        "thumbnails": {"default": {"url": "https://example.com/0.jpg"}},
+    },
+    "contentDetails": {"duration": "PT1M5S", "dimension": "2d"},
+    "statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": "1"},
+}
+
+
+def masked(item: dict, paths: list[str]) -> dict:
+    """
+    Copy of a response item holding only the given paths, like the API returns
+    for a fields= mask.
+    """
+    result = {}
+    for path in paths:
+        *parents, leaf = path.split(".")
+        source, target = item, result
+        for key in parents:
+            source = source.get(key, {})
+            target = target.setdefault(key, {})
+        if leaf in source:
+            target[leaf] = source[leaf]
+    return result
+
+
+def test_field_reader_fallbacks_and_defaults():
+    sources = {"title": "snippet.title", "time": ("snippet.a", "snippet.b")}
+    item = {"snippet": {"b": "2024"}}
+
+    assert field_reader(sources)(item) == {"title": None, "time": "2024"}
+    assert field_reader(sources, {"title": ""})(item)["title"] == ""
+    assert field_reader(sources)({"snippet": "text"})["title"] is None
+
+
+def test_fields_mask():
+    assert (
+        fields_mask(["id", "snippet.title", "snippet.tags"], "nextPageToken")
+        == "nextPageToken,items(id,snippet(title,tags))"
+    )
+
+
+def test_video_fields_defaults():
+    fields = video_fields({"id": "dQw4w9WgXcQ", "snippet": VIDEO_ITEM["snippet"]})
+
+    assert fields["description"] == ""
+    assert fields["topic_categories"] == []
+    assert fields["has_paid_product_placement"] is False
+    assert fields["view_count"] is None
+
+
+@pytest.mark.parametrize(
+    "builder, sources, item",
+    [
+        (video_fields, VIDEO_SOURCES, VIDEO_ITEM),
+        (
+            video_search_fields,
+            SEARCH_SOURCES["video"][1],
+            {"id": {"videoId": "dQw4w9WgXcQ"}, "snippet": VIDEO_ITEM["snippet"]},
+        ),
+        (
+            upload_fields,
+            UPLOAD_SOURCES,
+            {
+                "snippet": {
+                    **VIDEO_ITEM["snippet"],
+                    "resourceId": {"videoId": "dQw4w9WgXcQ"},
+                },
+                "contentDetails": {"videoPublishedAt": "2023-12-31T00:00:00Z"},
+            },
+        ),
+    ],
+)
+def test_builders_read_only_masked_paths(builder, sources, item):
+    paths = source_paths(VideoInfo, sources)
+    assert builder(masked(item, paths)) == builder(item)
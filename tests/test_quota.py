@@ -0,0 +1,216 @@
+import json
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from tools.google.credential_pool import CredentialPool, PooledCredential
+from tools.google.quota import QuotaExceededError, QuotaLedger, ToolBudgetExceededError
+from tools.google.youtube_tools import YoutubeTool
+
+
+def api_error(status: int, reason: str) -> HttpError:
+    content = json.dumps({"error": {"errors": [{"reason": reason}]}})
+    return HttpError(httplib2.Response({"status": status}), content.encode())
+
+
+class FakeService:
+    """
+    Youtube service whose list() calls return a fixed response or raise an
+    error, recording how often they were executed.
+    """
+
+    _http = None
+
+    def __init__(self, name: str, error: Exception | None = None) -> None:
+        self.name = name
+        self.error = error
+        self.calls = 0
+
+    def videos(self):
+        return self
+
+    def list(self, **params):
+        return self
+
+    def execute(self, http=None) -> dict:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"items": [], "served_by": self.name}
+
+
+@pytest.fixture
+def db(tmp_path) -> str:
+    return str(tmp_path / "quota.sqlite3")
+
+
+def test_reserve_charges_unit_costs(db):
+    ledger = QuotaLedger(db, daily_budget=250)
+
+    assert ledger.reserve("search", "search_videos") == 100
+    assert ledger.reserve("videos", "get_video_info") == 1
+    assert ledger.remaining() == 149
+    assert ledger.status()["tools"]["search_videos"]["calls"] == 1
+
+
+def test_daily_budget_rolls_back_the_failed_reservation(db):
+    ledger = QuotaLedger(db, daily_budget=150)
+    ledger.reserve("search", "search_videos")
+
+    with pytest.raises(QuotaExceededError):
+        ledger.reserve("search", "search_videos")
+    assert ledger.remaining() == 50
+    assert ledger.reserve("videos", "get_video_info") == 1
+
+
+def test_tool_budget(db):
+    ledger = QuotaLedger(db, tool_budgets={"search_videos": 150})
+    ledger.reserve("search", "search_videos")
+
+    with pytest.raises(ToolBudgetExceededError):
+        ledger.reserve("search", "search_videos")
+    assert ledger.remaining() == ledger.daily_budget - 100
+    ledger.reserve("search", "search_channel")
+
+
+def test_tool_budget_is_shared_by_credentials(db):
+    budgets = {"search_videos": 150}
+    first = QuotaLedger(db, tool_budgets=budgets, credential="first")
+    second = QuotaLedger(db, tool_budgets=budgets, credential="second")
+    first.reserve("search", "search_videos")
+
+    with pytest.raises(ToolBudgetExceededError):
+        second.reserve("search", "search_videos")
+
+
+def test_daily_budget_is_per_credential(db):
+    first = QuotaLedger(db, daily_budget=100, credential="first")
+    second = QuotaLedger(db, daily_budget=100, credential="second")
+    first.reserve("search", "search_videos")
+
+    assert second.reserve("search", "search_videos") == 100
+    assert QuotaLedger(db, daily_budget=100, credential="first").remaining() == 0
+
+
+def test_mark_exhausted(db):
+    ledger = QuotaLedger(db, daily_budget=500)
+    ledger.reserve("videos", "get_video_info")
+    ledger.mark_exhausted()
+
+    assert ledger.remaining() == 0
+    with pytest.raises(QuotaExceededError):
+        ledger.reserve("videos", "get_video_info")
+
+
+def pool(db: str, *names: str, **kwargs) -> CredentialPool:
+    return CredentialPool(
+        [
+            PooledCredential(name, None, QuotaLedger(db, credential=name))
+            for name in names
+        ],
+        **kwargs,
+    )
+
+
+def names(credentials: list[PooledCredential]) -> list[str]:
+    return [credential.name for credential in credentials]
+
+
+def test_candidates_prefer_the_most_quota_left(db):
+    credentials = pool(db, "a", "b", "c")
+    credentials.credentials[0].quota.reserve("search", "search_videos")
+    credentials.credentials[2].quota.reserve("videos", "get_video_info")
+
+    assert names(credentials.candidates()) == ["b", "c", "a"]
+
+
+def test_candidates_put_cooling_credentials_last(db):
+    credentials = pool(db, "a", "b", path=db)
+    credentials.cool_down(credentials.credentials[0])
+
+    assert names(credentials.candidates()) == ["b", "a"]
+    # Processes sharing the database share the cool-down
+    assert names(pool(db, "a", "b", path=db).candidates()) == ["b", "a"]
+
+
+@pytest.fixture
+def tool(tmp_path):
+    return YoutubeTool(
+        "client_secret.json",
+        cache_dir=str(tmp_path),
+        tool_budgets={"get_video_info": 2},
+    )
+
+
+def execute(tool: YoutubeTool, *services: FakeService) -> dict:
+    tool._init_pool({service.name: service for service in services})
+    tool._thread_http = lambda credential: None
+    return tool._execute("videos", "search_videos", {"part": "id"})
+
+
+def test_execute_fails_over_when_the_api_reports_quota_exceeded(tool):
+    first = FakeService("first", api_error(403, "quotaExceeded"))
+    second = FakeService("second")
+
+    assert execute(tool, first, second)["served_by"] == "second"
+    first_credential = tool.pool.credentials[0]
+    assert first_credential.quota.remaining() == 0
+    assert names(tool.pool.candidates()) == ["second", "first"]
+
+
+def test_execute_fails_over_and_cools_down_on_rate_limits(tool):
+    first = FakeService("first", api_error(403, "rateLimitExceeded"))
+    second = FakeService("second")
+
+    assert execute(tool, first, second)["served_by"] == "second"
+    assert names(tool.pool.candidates()) == ["second", "first"]
+
+
+def test_execute_does_not_fail_over_on_other_errors(tool):
+    first = FakeService("first", api_error(400, "badRequest"))
+    second = FakeService("second")
+
+    with pytest.raises(HttpError):
+        execute(tool, first, second)
+    assert second.calls == 0
+
+
+def test_execute_without_quota_left(tool):
+    tool.daily_quota = 0
+
+    with pytest.raises(QuotaExceededError, match="No credential has quota left"):
+        execute(tool, FakeService("first"), FakeService("second"))
+
+
+def test_tool_budget_does_not_fail_over(tool):
+    tool._init_pool({"first": FakeService("first"), "second": FakeService("second")})
+    tool._thread_http = lambda credential: None
+    tool._execute("videos", "get_video_info", {"part": "id"})
+    tool._execute("videos", "get_video_info", {"part": "id"})
+
+    with pytest.raises(ToolBudgetExceededError):
+        tool._execute("videos", "get_video_info", {"part": "id"})
+
+
+def raise_quota_exceeded(resource, tool, **params):
+    raise QuotaExceededError("Daily quota budget exhausted")
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda tool: tool.search_videos("python"),
+        lambda tool: tool.search_videos("python", fan_out=True),
+        lambda tool: tool.search_playlist("python"),
+        lambda tool: tool.search_channel("python"),
+        lambda tool: tool.get_video_info("dQw4w9WgXcQ"),
+        lambda tool: tool.get_channel_info("UC0000000000000000000000"),
+        lambda tool: tool.get_channel_info("@handle"),
+        lambda tool: tool.get_channel_videos("UC0000000000000000000000"),
+    ],
+)
+def test_tools_return_an_error_when_quota_runs_out(tool, monkeypatch, call):
+    monkeypatch.setattr(tool, "_list", raise_quota_exceeded)
+
+    assert call(tool) == "Error: Daily quota budget exhausted"
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from tools.google.result_filter import compile_filter
+from tools.google.youtube_tools import VideoInfo
+
+
+def video(index: int, **fields) -> VideoInfo:
+    defaults = {
+        "channel_id": "UC0",
+        "channel_title": "Channel",
+        "video_id": f"v{index}",
+        "video_title": f"Video {index}",
+        "description": "",
+        "published_at": datetime(2024, 1, 1 + index, tzinfo=timezone.utc),
+    }
+    return VideoInfo(**{**defaults, **fields})
+
+
+def ids(videos: list[VideoInfo]) -> list[str]:
+    return [video.video_id for video in videos]
+
+
+VIDEOS = [
+    video(0, view_count=50_000, like_count=10, duration_s=600, tags=["Python"]),
+    video(1, view_count=150_000, like_count=30, duration_s=900),
+    video(2, view_count=250_000, like_count=20, duration_s=1000, tags=["go"]),
+    video(3, view_count=500_000, like_count=40, duration_s=60),
+    video(4, like_count=50, duration_s=700),
+    video(5, view_count=120_000, like_count=5, duration_s=1200),
+]
+
+
+def test_request_example():
+    result_filter = compile_filter(
+        "views>=100000 and duration_s between 300 and 1200, sort -likes, limit 20",
+        VideoInfo,
+    )
+
+    assert ids(result_filter.apply(VIDEOS)) == ["v1", "v2", "v5"]
+    assert result_filter.fields == {"view_count", "duration_s", "like_count"}
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("views > 200k", ["v2", "v3"]),
+        ("views >= 150k", ["v1", "v2", "v3"]),
+        ("likes = 20", ["v2"]),
+        ("likes != 20", ["v0", "v1", "v3", "v4", "v5"]),
+        ("views < 100k or duration_s < 100", ["v0", "v3"]),
+        ("(views < 100k or likes > 35) and duration_s > 100", ["v0", "v4"]),
+        ("tags contains PYTHON", ["v0"]),
+        ("title contains 'video 3'", ["v3"]),
+        ("published >= 2024-01-05", ["v4", "v5"]),
+        ("published < '2024-01-02T00:00:00Z'", ["v0"]),
+        ("channel = channel and likes < 10", ["v5"]),
+    ],
+)
+def test_conditions(expression, expected):
+    assert ids(compile_filter(expression, VideoInfo).apply(VIDEOS)) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("sort views", ["v0", "v5", "v1", "v2", "v3", "v4"]),
+        ("sort -views, limit 2", ["v3", "v2"]),
+        ("sort -likes, views, limit 3", ["v4", "v3", "v1"]),
+        ("limit 2", ["v0", "v1"]),
+        ("likes > 15, limit 2", ["v1", "v2"]),
+    ],
+)
+def test_sort_and_limit(expression, expected):
+    assert ids(compile_filter(expression, VideoInfo).apply(VIDEOS)) == expected
+
+
+def test_heap_matches_full_sort():
+    videos = [video(i % 28, view_count=(i * 7919) % 1000) for i in range(200)]
+    result_filter = compile_filter("sort -views, published, limit 15", VideoInfo)
+
+    expected = sorted(videos, key=lambda item: (-item.view_count, item.published_at))
+    assert result_filter.apply(videos) == expected[:15]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "not views < 200k",
+        "not (views < 200k or likes > 100)",
+        "not tags contains go",
+    ],
+)
+def test_missing_fields_never_match(expression):
+    matched = compile_filter(expression, VideoInfo).apply(VIDEOS)
+    assert "v4" not in ids(matched)
+
+
+def test_not_inverts_known_values():
+    result_filter = compile_filter("not views < 200k", VideoInfo)
+    assert ids(result_filter.apply(VIDEOS)) == ["v2", "v3"]
+
+
+@pytest.mark.parametrize(
+    "expression, message",
+    [
+        ("views > 5,", "Unexpected end"),
+        ("sort -likes,", "Unexpected end"),
+        ("views >", "Unexpected end"),
+        ("views >= abc", "compared with numbers"),
+        ("foo > 1", "Unknown field"),
+        ("views > 1 limit 3", "Expected ','"),
+        ("views > 1, top 3", "Expected sort or limit"),
+        ("tags = x", "use contains"),
+        ("views contains 5", "text or list field"),
+        ("views > 1, limit 2.5", "Invalid limit"),
+        ("(views > 1", "Unexpected end"),
+        ("views > 1)", "Expected ','"),
+        ("published > 2024-13-01", "Invalid date"),
+        ("title ~ x", "Unexpected input"),
+    ],
+)
+def test_invalid_expressions(expression, message):
+    with pytest.raises(ValueError, match=message):
+        compile_filter(expression, VideoInfo)
@@ -0,0 +1,40 @@
+import pytest
+
+from tools.google.youtube_tools import extract_video_id, parse_video_ids
+
+
+@pytest.mark.parametrize(
+    "input_str, expected",
+    [
+        ("dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        (" dQw4w9WgXcQ ", "dQw4w9WgXcQ"),
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("youtube.com/watch?v=dQw4w9WgXcQ&t=42s", "dQw4w9WgXcQ"),
+        ("https://m.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("https://youtu.be/dQw4w9WgXcQ?si=abc", "dQw4w9WgXcQ"),
+        ("https://www.youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("https://www.youtube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("recommendations", None),
+        ("dQw4w9WgXcQx", None),
+        ("https://www.youtube.com/watch?v=short", None),
+        ("https://example.com/watch?v=dQw4w9WgXcQ", None),
+        ("https://www.youtube.com/@channel", None),
+        ("http://[", None),
+        ("", None),
+    ],
+)
+def test_extract_video_id(input_str, expected):
+    assert extract_video_id(input_str) == expected
+
+
+def test_parse_video_ids_skips_words():
+    assert parse_video_ids("check recommendations for dQw4w9WgXcQ") == [
+        "dQw4w9WgXcQ"
+    ]
+
+
+def test_parse_video_ids_deduplicates_urls_and_ids():
+    assert parse_video_ids(
+        "dQw4w9WgXcQ, https://youtu.be/dQw4w9WgXcQ https://youtu.be/9bZkp7q19f0"
+    ) == ["dQw4w9WgXcQ", "9bZkp7q19f0"]
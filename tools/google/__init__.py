@@ -1 +1,10 @@
-from .youtube_tools import YoutubeTool, extract_video_id
\ No newline at end of file
+from .youtube_tools import YoutubeTool, extract_video_id, parse_video_ids
+from .transcript_store import TranscriptStore
+from .workers import WorkerPool
+from .async_client import AsyncYoutubeClient, YoutubeApiError
+from .quota import QuotaExceededError, QuotaLedger, ToolBudgetExceededError
+from .credential_pool import CredentialPool, PooledCredential
+from .execution import RetryPolicy, TokenBucket
+from .batching import BatchLoader
+from .transcripts import HostLimiter, download_many
+from .token_refresh import TokenRefresher
\ No newline at end of file
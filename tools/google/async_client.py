@@ -0,0 +1,150 @@
+import asyncio
+import importlib.util
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3/"
+
+# HTTP/2 needs the optional h2 package; without it the client keeps using
+# pooled HTTP/1.1 keep-alive connections.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class YoutubeApiError(Exception):
+    """
+    Error response from the Youtube Data API.
+    """
+
+    def __init__(self, status: int, reason: str, message: str) -> None:
+        super().__init__(f"HTTP {status} {reason}: {message}")
+        self.status = status
+        self.reason = reason
+        self.message = message
+
+    @classmethod
+    def from_response(cls, response: "httpx.Response") -> "YoutubeApiError":
+        try:
+            error = response.json()["error"]
+            reason = error.get("errors", [{}])[0].get("reason", "")
+            message = error.get("message", "")
+        except (ValueError, KeyError, IndexError, TypeError):
+            reason, message = "", response.text
+
+        return cls(response.status_code, reason, message)
+
+
+class AsyncYoutubeClient:
+    """
+    Lean async client for the Youtube Data API list endpoints.
+
+    All calls share one httpx.AsyncClient, so connections are kept alive and,
+    when h2 is installed, multiplexed over HTTP/2. Responses are gzip-encoded.
+
+    This is a standalone building block. YoutubeTool does not use it: its
+    tools call the API through googleapiclient, behind the rate limiter,
+    request coalescing, quota ledger and credential pool, none of which apply
+    to this client.
+    """
+
+    def __init__(
+        self,
+        credentials=None,
+        api_key: str | None = None,
+        base_url: str = API_BASE_URL,
+        max_connections: int = 20,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ) -> None:
+        """
+        Args:
+            credentials: google.oauth2 Credentials, as loaded by create_service.
+            api_key: API key, used when no credentials are given.
+            base_url: Base URL of the Youtube Data API.
+            max_connections: Maximum number of open connections.
+            transport: httpx transport to send requests with, instead of
+                opening connections.
+        """
+        if credentials is None and api_key is None:
+            raise ValueError("Either credentials or an API key is required")
+
+        import httpx
+
+        self.credentials = credentials
+        self.api_key = api_key
+        self._refresh_lock = asyncio.Lock()
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=HTTP2_AVAILABLE,
+            headers={"Accept-Encoding": "gzip"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60,
+            ),
+            timeout=30,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncYoutubeClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _auth_headers(self) -> dict:
+        """
+        Authorization headers for the next request, refreshing expired
+        credentials once even when many calls notice the expiry together.
+        """
+        headers = {}
+        if self.credentials is None:
+            return headers
+
+        if not self.credentials.valid:
+            async with self._refresh_lock:
+                if not self.credentials.valid:
+                    from google.auth.transport.requests import Request
+
+                    await asyncio.to_thread(self.credentials.refresh, Request())
+
+        self.credentials.apply(headers)
+        return headers
+
+    async def list(self, resource: str, **params) -> dict:
+        """
+        Call the list method of a Youtube Data API resource.
+
+        Args:
+            resource: Name of the API resource, e.g. "videos" or "search".
+            params: Query parameters. Parameters set to None are left out.
+
+        Returns:
+            dict: The API response
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        if self.api_key and self.credentials is None:
+            params["key"] = self.api_key
+
+        response = await self._client.get(
+            resource, params=params, headers=await self._auth_headers()
+        )
+        if response.status_code != 200:
+            raise YoutubeApiError.from_response(response)
+
+        return response.json()
+
+    async def search_list(self, **params) -> dict:
+        return await self.list("search", **params)
+
+    async def videos_list(self, **params) -> dict:
+        return await self.list("videos", **params)
+
+    async def channels_list(self, **params) -> dict:
+        return await self.list("channels", **params)
+
+    async def playlist_items_list(self, **params) -> dict:
+        return await self.list("playlistItems", **params)
@@ -0,0 +1,147 @@
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Hashable
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50)
+
+
+class BatchLoader:
+    """
+    Micro-batching dataloader.
+
+    Keys submitted by concurrent callers within a short window are collected per
+    group and loaded together in one call of the batch function. A batch is
+    dispatched when the window closes or as soon as it reaches max_batch_size.
+    Keys already waiting in an open batch are shared rather than loaded twice.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[Hashable, list[str], str], dict[str, Any]],
+        executor: Executor,
+        window: float = 0.005,
+        max_batch_size: int = 50,
+    ) -> None:
+        """
+        Args:
+            batch_fn: Called as batch_fn(group, keys, tool) and returns a mapping
+                of key to loaded value. Keys missing from the mapping load as None.
+            executor: Executor the batches run on.
+            window: Seconds to wait for more keys after the first one arrives.
+            max_batch_size: Maximum number of keys per batch.
+        """
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, tuple[str, dict[str, Future]]] = {}
+        self._timers: dict[Hashable, threading.Timer] = {}
+
+        self._batches = 0
+        self._keys = 0
+        self._shared_keys = 0
+        self._histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+
+    def submit(
+        self, group: Hashable, keys: list[str], tool: str
+    ) -> dict[str, Future]:
+        """
+        Queue keys for loading.
+
+        Args:
+            group: Batch group; only keys of the same group are loaded together.
+            keys: Keys to load.
+            tool: Name of the tool the keys are loaded for.
+
+        Returns:
+            dict: Key to a Future resolving to the loaded value or None
+        """
+        futures = {}
+
+        with self._lock:
+            for key in keys:
+                _, pending = self._pending.setdefault(group, (tool, {}))
+                future = pending.get(key)
+                if future is None:
+                    future = pending[key] = Future()
+                else:
+                    self._shared_keys += 1
+                futures[key] = future
+
+                if len(pending) >= self.max_batch_size:
+                    self._dispatch(group)
+
+            if group in self._pending and group not in self._timers:
+                timer = threading.Timer(self.window, self._flush, args=(group,))
+                timer.daemon = True
+                self._timers[group] = timer
+                timer.start()
+
+        return futures
+
+    def load_many(
+        self, group: Hashable, keys: list[str], tool: str
+    ) -> dict[str, Any]:
+        """
+        Load keys and wait for the results.
+
+        Returns:
+            dict: Key to loaded value or None
+        """
+        futures = self.submit(group, keys, tool)
+        return {key: future.result() for key, future in futures.items()}
+
+    def _flush(self, group: Hashable) -> None:
+        with self._lock:
+            if group in self._pending:
+                self._dispatch(group)
+
+    def _dispatch(self, group: Hashable) -> None:
+        """
+        Send the open batch of a group. Must be called with the lock held.
+        """
+        tool, batch = self._pending.pop(group)
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+
+        self._batches += 1
+        self._keys += len(batch)
+        for bucket in BATCH_SIZE_BUCKETS:
+            if len(batch) <= bucket:
+                self._histogram[bucket] += 1
+                break
+
+        self._executor.submit(self._run, group, tool, batch)
+
+    def _run(self, group: Hashable, tool: str, batch: dict[str, Future]) -> None:
+        try:
+            results = self.batch_fn(group, list(batch), tool)
+        except BaseException as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            future.set_result(results.get(key))
+
+    def stats(self) -> dict:
+        """
+        Batch size metrics since the loader was created.
+        """
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "keys": self._keys,
+                "shared_keys": self._shared_keys,
+                "average_batch_size": (
+                    self._keys / self._batches if self._batches else 0
+                ),
+                "batch_size_histogram": {
+                    f"<={bucket}": count for bucket, count in self._histogram.items()
+                },
+                "window_ms": self.window * 1000,
+                "max_batch_size": self.max_batch_size,
+            }
@@ -0,0 +1,240 @@
+import atexit
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import typing
+from datetime import datetime, timezone
+from pydantic import BaseModel
+
+# SQL a catalog query may run: reads only, no ATTACH, PRAGMA or writes
+READ_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    sqlite3.SQLITE_RECURSIVE,
+}
+QUERY_TIMEOUT = 2.0
+
+
+def _column_type(annotation) -> str:
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is not list and args:
+        annotation = args[0]
+
+    if annotation in (int, bool):
+        return "INTEGER"
+    if annotation is float:
+        return "REAL"
+    return "TEXT"
+
+
+def _column_value(value):
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    if isinstance(value, list):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class Catalog:
+    """
+    Local SQLite warehouse of every video, channel and playlist the tools
+    returned, one table per model with a column per model field.
+
+    Models are written behind the tool calls: add() only queues them, and a
+    background thread upserts the queue in one transaction per batch. Upserts
+    keep the stored value of columns a model leaves empty, so videos from a
+    search do not erase statistics stored by an earlier lookup.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        tables: dict[str, tuple[type[BaseModel], str, list[str]]],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            path: Path of the SQLite database file.
+            tables: Table name to the model stored in it, its key field and the
+                fields to index, e.g. {"videos": (VideoInfo, "video_id",
+                ["channel_id"])}.
+            batch_size: Queued models that trigger a write before the interval.
+            flush_interval: Seconds between background writes.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._tables = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._conn:
+            for table, (model, key, indexes) in tables.items():
+                self._create_table(table, model, key, indexes)
+
+    def _create_table(
+        self, table: str, model: type[BaseModel], key: str, indexes: list[str]
+    ) -> None:
+        columns = {
+            name: _column_type(field.annotation)
+            for name, field in model.model_fields.items()
+        }
+        definitions = [
+            f"{name} {column_type}" + (" PRIMARY KEY" if name == key else "")
+            for name, column_type in columns.items()
+        ]
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"({', '.join(definitions)}, updated_at REAL NOT NULL)"
+        )
+
+        # Fields added to a model after the table was created
+        existing = {
+            row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")
+        }
+        for name, column_type in columns.items():
+            if name not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"
+                )
+
+        for name in indexes:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} ({name})"
+            )
+
+        names = list(columns)
+        updates = ", ".join(
+            f"{name} = COALESCE(excluded.{name}, {name})"
+            for name in names
+            if name != key
+        )
+        statement = (
+            f"INSERT INTO {table} ({', '.join(names)}, updated_at) "
+            f"VALUES ({', '.join('?' * (len(names) + 1))}) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}, "
+            f"updated_at = excluded.updated_at"
+        )
+        self._tables[model] = (statement, names)
+
+    def add(self, models: list[BaseModel]) -> None:
+        """
+        Queue models to be upserted, starting the writer thread if needed.
+        Models of types without a table are ignored.
+        """
+        models = [model for model in models if type(model) in self._tables]
+        if not models:
+            return
+
+        with self._lock:
+            self._pending.extend(models)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="catalog-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def flush(self) -> None:
+        """
+        Write all queued models now.
+        """
+        with self._write_lock:
+            with self._lock:
+                models, self._pending = self._pending, []
+            if not models:
+                return
+
+            rows = {}
+            now = time.time()
+            for model in models:
+                statement, names = self._tables[type(model)]
+                rows.setdefault(statement, []).append(
+                    [_column_value(getattr(model, name, None)) for name in names]
+                    + [now]
+                )
+
+            with self._conn:
+                for statement, values in rows.items():
+                    self._conn.executemany(statement, values)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The batch is dropped, later batches are still written
+                pass
+
+    def close(self) -> None:
+        """
+        Stop the writer thread and write what is still queued.
+        """
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def query(self, sql: str, max_rows: int = 100) -> dict:
+        """
+        Run a read-only SQL query against the catalog.
+
+        Queued models are written first, so the query sees everything fetched
+        so far. The query runs on a read-only connection that may only read
+        tables, and is interrupted after QUERY_TIMEOUT seconds.
+
+        Args:
+            sql: A single SELECT statement.
+            max_rows: Maximum number of rows to return.
+
+        Returns:
+            dict: The column names, the rows, and whether rows were cut off
+
+        Raises:
+            sqlite3.Error: If the query is invalid, not read-only or too slow.
+        """
+        self.flush()
+
+        uri = pathlib.Path(self.path).absolute().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=30)
+        try:
+            conn.set_authorizer(
+                lambda action, *args: sqlite3.SQLITE_OK
+                if action in READ_ACTIONS
+                else sqlite3.SQLITE_DENY
+            )
+            deadline = time.monotonic() + QUERY_TIMEOUT
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+
+            cursor = conn.execute(sql)
+            rows = cursor.fetchmany(max_rows + 1)
+            columns = [column[0] for column in cursor.description or []]
+        finally:
+            conn.close()
+
+        return {
+            "columns": columns,
+            "rows": [list(row) for row in rows[:max_rows]],
+            "truncated": len(rows) > max_rows,
+        }
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+from tools.google.quota import QuotaLedger
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+
+
+class PooledCredential:
+    """
+    A Youtube service built from one OAuth token or API key, with its own quota.
+    """
+
+    def __init__(self, name: str, service: "Resource", quota: QuotaLedger) -> None:
+        self.name = name
+        self.service = service
+        self.quota = quota
+        self.cooling_until = 0.0
+
+
+class CredentialPool:
+    """
+    Spreads Youtube Data API calls across several credentials.
+
+    Calls go to the credential with the most quota left today. A credential
+    that hits a rate limit is moved to the back of the line for a cool-down
+    period. Cool-downs can be kept in an SQLite database, so that server
+    processes sharing it also share them.
+    """
+
+    def __init__(
+        self,
+        credentials: list[PooledCredential],
+        cooldown: float = 60,
+        path: str | None = None,
+    ) -> None:
+        """
+        Args:
+            credentials: Credentials in the pool.
+            cooldown: Seconds a rate limited credential is deprioritized for.
+            path: Path of the SQLite database file shared with other processes.
+                Cool-downs are kept in memory if not given.
+        """
+        if not credentials:
+            raise ValueError("A credential pool needs at least one credential")
+
+        self.credentials = credentials
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(
+                path, check_same_thread=False, timeout=30, isolation_level=None
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS credential_cooldowns (
+                    credential TEXT PRIMARY KEY,
+                    cooling_until REAL NOT NULL
+                )
+                """
+            )
+
+    def _cooling(self) -> dict[str, bool]:
+        """
+        Whether each credential is cooling down. Must be called with the lock held.
+        """
+        now = time.time()
+        if self._conn is not None:
+            rows = self._conn.execute(
+                "SELECT credential, cooling_until FROM credential_cooldowns"
+            ).fetchall()
+            by_name = {credential.name: credential for credential in self.credentials}
+            for name, cooling_until in rows:
+                if name in by_name:
+                    by_name[name].cooling_until = cooling_until
+
+        return {c.name: c.cooling_until > now for c in self.credentials}
+
+    def candidates(self) -> list[PooledCredential]:
+        """
+        Credentials in the order they should be tried: those not cooling down
+        first, then by remaining quota.
+        """
+        with self._lock:
+            cooling = self._cooling()
+
+        return sorted(
+            self.credentials,
+            key=lambda c: (cooling[c.name], -c.quota.remaining()),
+        )
+
+    def cool_down(self, credential: PooledCredential) -> None:
+        """
+        Deprioritize a credential after it was rate limited.
+        """
+        with self._lock:
+            credential.cooling_until = time.time() + self.cooldown
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO credential_cooldowns VALUES (?, ?)",
+                    (credential.name, credential.cooling_until),
+                )
+
+    def status(self) -> list[dict]:
+        """
+        Today's quota usage of every credential in the pool.
+        """
+        with self._lock:
+            cooling = self._cooling()
+
+        return [
+            {
+                **credential.quota.status(),
+                "cooling_down": cooling[credential.name],
+            }
+            for credential in self.credentials
+        ]
@@ -0,0 +1,218 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Seconds a cached API part stays fresh. Descriptive metadata rarely changes,
+# counters move constantly.
+PART_TTLS = {
+    "snippet": 7 * 24 * 3600,
+    "contentDetails": 7 * 24 * 3600,
+    "topicDetails": 7 * 24 * 3600,
+    "paidProductPlacementDetails": 24 * 3600,
+    "statistics": 15 * 60,
+}
+DEFAULT_TTL = 3600
+# Search result pages change as videos are published
+PAGE_TTL = 3600
+
+
+class EntityCache:
+    """
+    SQLite backed cache of Youtube Data API resources, stored per entity and part.
+
+    Each part of a videos/channels list item is cached on its own, so a request
+    only needs to fetch the parts that are missing or stale.
+    """
+
+    def __init__(self, path: str, part_ttls: dict[str, int] | None = None) -> None:
+        """
+        Args:
+            path: Path of the SQLite database file.
+            part_ttls: Overrides for the per-part TTLs in seconds.
+        """
+        self.path = path
+        self.part_ttls = {**PART_TTLS, **(part_ttls or {})}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entity_parts (
+                kind TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                part TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                payload TEXT,
+                PRIMARY KEY (kind, entity_id, part)
+            );
+            CREATE TABLE IF NOT EXISTS sync_watermarks (
+                kind TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                watermark TEXT NOT NULL,
+                PRIMARY KEY (kind, entity_id)
+            );
+            CREATE TABLE IF NOT EXISTS entity_aliases (
+                kind TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (kind, alias)
+            );
+            CREATE TABLE IF NOT EXISTS result_pages (
+                request_key TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+            """
+        )
+
+    def get(
+        self, kind: str, entity_ids: list[str], parts: list[str]
+    ) -> dict[str, dict]:
+        """
+        Look up the fresh cached parts of the given entities.
+
+        Args:
+            kind: Resource kind, e.g. "videos" or "channels".
+            entity_ids: IDs of the entities to look up.
+            parts: API parts to look up.
+
+        Returns:
+            dict: Entity ID to a mapping of part name to payload. A payload of None
+                means the API returned no data for that part.
+        """
+        now = time.time()
+        results = {}
+
+        with self._lock:
+            for i in range(0, len(entity_ids), 500):
+                ids = entity_ids[i : i + 500]
+                rows = self._conn.execute(
+                    f"""
+                    SELECT entity_id, part, fetched_at, payload FROM entity_parts
+                    WHERE kind = ? AND entity_id IN ({",".join("?" * len(ids))})
+                    """,
+                    (kind, *ids),
+                ).fetchall()
+
+                for entity_id, part, fetched_at, payload in rows:
+                    if part not in parts:
+                        continue
+                    if now - fetched_at > self.part_ttls.get(part, DEFAULT_TTL):
+                        continue
+                    results.setdefault(entity_id, {})[part] = (
+                        json.loads(payload) if payload is not None else None
+                    )
+
+        return results
+
+    def put(self, kind: str, items: list[dict], parts: list[str]) -> None:
+        """
+        Store the given parts of API response items.
+
+        Args:
+            kind: Resource kind, e.g. "videos" or "channels".
+            items: Items of a list() response.
+            parts: API parts that were requested for the items.
+        """
+        now = time.time()
+        rows = [
+            (
+                kind,
+                item["id"],
+                part,
+                now,
+                json.dumps(item[part]) if part in item else None,
+            )
+            for item in items
+            for part in parts
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entity_parts VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def get_alias(self, kind: str, alias: str) -> str | None:
+        """
+        Resolve an alias, such as a channel handle, to a cached entity ID.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entity_id, fetched_at FROM entity_aliases WHERE kind = ? AND alias = ?",
+                (kind, alias.lower()),
+            ).fetchone()
+
+        if row and time.time() - row[1] <= self.part_ttls["snippet"]:
+            return row[0]
+
+        return None
+
+    def put_alias(self, kind: str, alias: str, entity_id: str) -> None:
+        """
+        Remember that an alias, such as a channel handle, refers to an entity ID.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entity_aliases VALUES (?, ?, ?, ?)",
+                (kind, alias.lower(), entity_id, time.time()),
+            )
+
+    def get_watermark(self, kind: str, entity_id: str) -> str | None:
+        """
+        Get the sync watermark of an entity, e.g. the publish time of the newest
+        upload already synced for a channel.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM sync_watermarks WHERE kind = ? AND entity_id = ?",
+                (kind, entity_id),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def put_watermark(self, kind: str, entity_id: str, watermark: str) -> None:
+        """
+        Set the sync watermark of an entity. Watermarks never expire.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_watermarks VALUES (?, ?, ?)",
+                (kind, entity_id, watermark),
+            )
+
+    def get_page(self, key: str) -> dict | None:
+        """
+        Get a fresh cached response page, such as a page of search results.
+
+        Args:
+            key: Identity of the request, as made by request_key.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, payload FROM result_pages WHERE request_key = ?",
+                (key,),
+            ).fetchone()
+
+        if row and time.time() - row[0] <= PAGE_TTL:
+            return json.loads(row[1])
+
+        return None
+
+    def put_page(self, key: str, response: dict) -> None:
+        """
+        Store a response page under the identity of its request.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_pages VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(response)),
+            )
@@ -0,0 +1,189 @@
+import email.utils
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+# Responses worth retrying: rate limits and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter with an adaptive rate.
+
+    The rate is halved whenever the API reports a rate limit and creeps back up
+    by a fixed step after every successful call, down to min_rate and up to the
+    configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int | None = None,
+        min_rate: float = 0.5,
+        recovery: float = 0.1,
+    ) -> None:
+        """
+        Args:
+            rate: Maximum sustained requests per second.
+            burst: Bucket size, i.e. requests allowed at once. Defaults to rate.
+            min_rate: Lowest rate the limiter backs off to.
+            recovery: Requests per second regained after each success.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+
+
+class RetryPolicy:
+    """
+    Bounded retries with full-jitter exponential backoff.
+    """
+
+    def __init__(
+        self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 32.0
+    ) -> None:
+        """
+        Args:
+            max_attempts: Attempts per call, including the first one.
+            base_delay: Backoff ceiling in seconds after the first failure.
+            max_delay: Upper bound for any single backoff.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 0.
+            retry_after: Delay requested by the server through Retry-After.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+
+        return delay
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so they share one in-flight execution.
+
+    The first caller for a key runs the call; callers arriving with the same key
+    while it is in flight wait for it and receive the same result or exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run func, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identity of the call.
+            func: Function performing the call.
+
+        Returns:
+            The result of the call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def request_key(resource: str, params: dict) -> str:
+    """
+    Normalized identity of a list() call, ignoring unset parameters and the
+    order of the requested parts.
+    """
+    normalized = {key: value for key, value in params.items() if value is not None}
+    if isinstance(normalized.get("part"), str):
+        normalized["part"] = ",".join(
+            sorted(part.strip() for part in normalized["part"].split(","))
+        )
+
+    return json.dumps([resource, normalized], sort_keys=True, default=str)
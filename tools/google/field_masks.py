@@ -0,0 +1,175 @@
+import functools
+from typing import Annotated, Callable
+from pydantic import BaseModel, TypeAdapter
+
+# Paging fields read from list() responses, besides the items
+PAGE_ENVELOPE = "nextPageToken,pageInfo(totalResults)"
+
+
+def _paths(source: str | tuple[str, ...]) -> tuple[str, ...]:
+    return source if isinstance(source, tuple) else (source,)
+
+
+def source_paths(
+    model: type[BaseModel], sources: dict, parts: list[str] | None = None
+) -> list[str]:
+    """
+    API response paths a model is built from.
+
+    Args:
+        model: Model built from list() response items.
+        sources: Model field name to the dotted path of the response field it
+            is read from, e.g. "snippet.title", or a tuple of fallback paths.
+            Model fields without a source are not read from the response.
+        parts: Only return paths within these parts. The "id" part is always
+            included.
+
+    Returns:
+        list[str]: Dotted response paths, in model field order
+    """
+    paths = []
+    for name in model.model_fields:
+        for path in _paths(sources.get(name, ())):
+            part = path.split(".", 1)[0]
+            if parts is not None and part != "id" and part not in parts:
+                continue
+            if path not in paths:
+                paths.append(path)
+
+    return paths
+
+
+def fields_mask(paths: list[str], envelope: str | None = None) -> str:
+    """
+    Build a fields= partial response mask that selects the given paths of every
+    response item.
+
+    Args:
+        paths: Dotted item paths, e.g. ["id", "snippet.title"].
+        envelope: Response fields to select besides the items.
+
+    Returns:
+        str: The mask, e.g. "items(id,snippet(title))"
+    """
+    tree = {}
+    for path in paths:
+        node = tree
+        for key in path.split("."):
+            node = node.setdefault(key, {})
+
+    def render(node: dict) -> str:
+        return ",".join(
+            f"{key}({render(children)})" if children else key
+            for key, children in node.items()
+        )
+
+    mask = f"items({render(tree)})"
+    return f"{envelope},{mask}" if envelope else mask
+
+
+def parts_for_fields(sources: dict, fields: list[str]) -> list[str]:
+    """
+    API parts needed to fill the given model fields.
+
+    Raises:
+        ValueError: If a field has no source.
+    """
+    unknown = [name for name in fields if name not in sources]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    parts = []
+    for name in fields:
+        for path in _paths(sources[name]):
+            part = path.split(".", 1)[0]
+            if part != "id" and part not in parts:
+                parts.append(part)
+
+    return parts
+
+
+@functools.lru_cache(maxsize=None)
+def _keys(path: str) -> tuple[str, ...]:
+    return tuple(path.split("."))
+
+
+def _lookup(item: dict, source: str | tuple[str, ...]):
+    """
+    Value of the first source path that is present in a response item.
+    """
+    for path in _paths(source):
+        value = item
+        for key in _keys(path):
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is not None:
+            return value
+
+    return None
+
+
+def field_reader(sources: dict, defaults: dict | None = None) -> Callable[[dict], dict]:
+    """
+    Build a function that reads the raw model field values of a response item
+    from the same sources its field mask is built from.
+
+    The source paths are split once here, as the reader runs for every item.
+
+    Args:
+        sources: Model field name to the response path(s) it is read from.
+        defaults: Values of fields whose source is missing from the item.
+            Other missing fields are None.
+
+    Returns:
+        Callable[[dict], dict]: Reader of field values, ready to be validated
+            into the model
+    """
+    defaults = defaults or {}
+    plan = [
+        (name, [_keys(path) for path in _paths(source)], defaults.get(name))
+        for name, source in sources.items()
+    ]
+
+    def read(item: dict) -> dict:
+        values = {}
+        for name, paths, default in plan:
+            for keys in paths:
+                value = item
+                for key in keys:
+                    if not isinstance(value, dict):
+                        value = None
+                        break
+                    value = value.get(key)
+                if value is not None:
+                    break
+            values[name] = default if value is None else value
+        return values
+
+    return read
+
+
+@functools.lru_cache(maxsize=None)
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    field = model.model_fields[name]
+    if field.metadata:
+        return TypeAdapter(Annotated[(field.annotation, *field.metadata)])
+    return TypeAdapter(field.annotation)
+
+
+def model_from_item(
+    model: type[BaseModel], sources: dict, item: dict, fields: list[str]
+) -> BaseModel:
+    """
+    Build a partial model holding only the given fields of a response item.
+
+    Each value is validated on its own, so counts and timestamps are parsed
+    like in a full model. The model is constructed without validating required
+    fields, and the fields that are not set are left out of
+    model_dump(exclude_unset=True).
+    """
+    values = {}
+    for name in fields:
+        value = _lookup(item, sources[name])
+        if value is not None:
+            values[name] = _field_adapter(model, name).validate_python(value)
+
+    return model.model_construct(**values)
@@ -1,44 +1,100 @@
 import os
+import argparse
 from abc import ABC, abstractmethod
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/{api}/{apiVersion}/rest"
+DISCOVERY_DIR = "discovery_files"
 
-def create_service(client_secret_file, api_name, api_version, *scopes, prefix=''):
+
+def get_discovery_document(api_name, api_version, refresh=False):
     """
-    Create a Google API service instance.
+    Get the discovery document of a Google API without a network round trip.
+
+    The document is read from the local discovery cache. On first use the cache is
+    seeded from the copy bundled with google-api-python-client, falling back to a
+    download if the bundled copy is missing.
 
     Args:
-        client_secret_file: Path to client secret JSON file
         api_name: Name of the API Service
         api_version: Version of the API
-        scopes: Authorization scopes required by the API
-        prefix: Optional prefix for token filename
+        refresh: Download the latest document and overwrite the cached copy
 
     Returns:
-        Google API service instance or None if creation failed
+        The discovery document as a JSON string
     """
 
-    CLIENT_SECRET_FILE = client_secret_file
-    API_SERVICE_NAME = api_name
-    API_VERSION = api_version
-    SCOPES = [scope for scope in scopes[0]]
+    discovery_dir = os.path.join(os.getcwd(), DISCOVERY_DIR)
+    discovery_file = os.path.join(discovery_dir, f"{api_name}.{api_version}.json")
+
+    if not refresh and os.path.exists(discovery_file):
+        with open(discovery_file, "r") as document:
+            return document.read()
+
+    content = None if refresh else get_static_doc(api_name, api_version)
+    if content is None:
+        response, content = build_http().request(
+            DISCOVERY_URL.format(api=api_name, apiVersion=api_version)
+        )
+        if response.status != 200:
+            raise Exception(
+                f"Failed to download discovery document: HTTP {response.status}"
+            )
+        content = content.decode("utf-8")
+
+    os.makedirs(discovery_dir, exist_ok=True)
+    tmp_file = f"{discovery_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as document:
+        document.write(content)
+    os.replace(tmp_file, discovery_file)
+
+    return content
+
+
+def token_file_path(api_name, api_version, prefix=""):
+    """
+    Path of the OAuth token file for an API, creating the token folder if needed.
+    """
 
-    creds = None
     working_dir = os.getcwd()
     token_dir = "token_files"
-    token_file = f"token_{API_SERVICE_NAME}_{API_VERSION}{prefix}.json"
+    token_file = f"token_{api_name}_{api_version}{prefix}.json"
 
     # Check if token dir exists first, if not, create the folder
     if not os.path.exists(os.path.join(working_dir, token_dir)):
         os.mkdir(os.path.join(working_dir, token_dir))
 
-    if os.path.exists(os.path.join(working_dir, token_dir, token_file)):
-        creds = Credentials.from_authorized_user_file(
-            os.path.join(working_dir, token_dir, token_file), SCOPES
-        )
+    return os.path.join(working_dir, token_dir, token_file)
+
+
+def load_credentials(client_secret_file, api_name, api_version, *scopes, prefix=""):
+    """
+    Load OAuth credentials for a Google API, running the consent flow if needed.
+
+    Args:
+        client_secret_file: Path to client secret JSON file
+        api_name: Name of the API Service
+        api_version: Version of the API
+        scopes: Authorization scopes required by the API
+        prefix: Optional prefix for token filename
+
+    Returns:
+        Valid google.oauth2 Credentials
+    """
+
+    CLIENT_SECRET_FILE = client_secret_file
+    SCOPES = [scope for scope in scopes[0]]
+
+    creds = None
+    token_file = token_file_path(api_name, api_version, prefix)
+
+    if os.path.exists(token_file):
+        creds = Credentials.from_authorized_user_file(token_file, SCOPES)
 
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -47,14 +103,49 @@ def create_service(client_secret_file, api_name, api_version, *scopes, prefix=''
             flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
             creds = flow.run_local_server(port=0)
 
-        with open(os.path.join(working_dir, token_dir, token_file), "w") as token:
+        with open(token_file, "w") as token:
             token.write(creds.to_json())
 
+    return creds
+
+
+def create_service(client_secret_file, api_name, api_version, *scopes, prefix=''):
+    """
+    Create a Google API service instance.
+
+    Args:
+        client_secret_file: Path to client secret JSON file
+        api_name: Name of the API Service
+        api_version: Version of the API
+        scopes: Authorization scopes required by the API
+        prefix: Optional prefix for token filename
+
+    Returns:
+        Google API service instance or None if creation failed
+    """
+
+    creds = load_credentials(
+        client_secret_file, api_name, api_version, *scopes, prefix=prefix
+    )
+
     try:
-        service = build(
-            API_SERVICE_NAME, API_VERSION, credentials=creds, static_discovery=False
+        service = build_from_document(
+            get_discovery_document(api_name, api_version), credentials=creds
         )
         return service
     except Exception as e:
-        os.remove(os.path.join(working_dir, token_dir, token_file))
+        os.remove(token_file_path(api_name, api_version, prefix))
         return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Manage cached Google API discovery documents"
+    )
+    parser.add_argument("command", choices=["refresh-discovery"])
+    parser.add_argument("api_name", nargs="?", default="youtube")
+    parser.add_argument("api_version", nargs="?", default="v3")
+    args = parser.parse_args()
+
+    get_discovery_document(args.api_name, args.api_version, refresh=True)
+    print(f"Refreshed discovery document for {args.api_name} {args.api_version}")
@@ -0,0 +1,236 @@
+import datetime
+import os
+import sqlite3
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Quota units charged per call of each resource's list() method.
+# https://developers.google.com/youtube/v3/determine_quota_cost
+UNIT_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlists": 1,
+    "playlistItems": 1,
+}
+DEFAULT_DAILY_QUOTA = 10000
+
+try:
+    # Youtube Data API quotas reset at midnight Pacific Time.
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except ZoneInfoNotFoundError:
+    QUOTA_TIMEZONE = datetime.timezone(datetime.timedelta(hours=-8))
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when a call would exceed a daily or per-tool quota budget.
+    """
+
+
+class ToolBudgetExceededError(QuotaExceededError):
+    """
+    Raised when a call would exceed the daily budget of the calling tool.
+    """
+
+
+def quota_day() -> str:
+    """
+    The current quota day as an ISO date in Pacific Time.
+    """
+    return datetime.datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+
+class QuotaLedger:
+    """
+    Persistent ledger of Youtube Data API quota usage.
+
+    Every call reserves its unit cost before it is executed. A reservation fails
+    with QuotaExceededError when it would push the daily total of the credential,
+    or the daily total of the calling tool, over its budget.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        daily_budget: int = DEFAULT_DAILY_QUOTA,
+        tool_budgets: dict[str, int] | None = None,
+        credential: str = "default",
+    ) -> None:
+        """
+        Args:
+            path: Path of the SQLite database file.
+            daily_budget: Units the credential may spend per quota day.
+            tool_budgets: Units each tool may spend per quota day.
+            credential: Name of the credential, i.e. API project, being metered.
+        """
+        self.path = path
+        self.daily_budget = daily_budget
+        self.tool_budgets = tool_budgets or {}
+        self.credential = credential
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quota_usage (
+                day TEXT NOT NULL,
+                credential TEXT NOT NULL,
+                tool TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                units INTEGER NOT NULL,
+                calls INTEGER NOT NULL,
+                PRIMARY KEY (day, credential, tool, endpoint)
+            )
+            """
+        )
+
+    @staticmethod
+    def cost(endpoint: str) -> int:
+        """
+        Unit cost of one list() call on an API resource.
+        """
+        return UNIT_COSTS.get(endpoint, 1)
+
+    def _used(self, day: str, tool: str | None = None) -> int:
+        """
+        Units used on a day by the credential or, if a tool is given, by the
+        tool across all credentials sharing the ledger database.
+        """
+        if tool is None:
+            query = "WHERE day = ? AND credential = ?"
+            params = (day, self.credential)
+        else:
+            query = "WHERE day = ? AND tool = ?"
+            params = (day, tool)
+
+        return self._conn.execute(
+            f"SELECT COALESCE(SUM(units), 0) FROM quota_usage {query}", params
+        ).fetchone()[0]
+
+    def _record(self, day: str, tool: str, endpoint: str, units: int) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO quota_usage VALUES (?, ?, ?, ?, ?, 1)
+            ON CONFLICT (day, credential, tool, endpoint)
+            DO UPDATE SET units = units + excluded.units, calls = calls + 1
+            """,
+            (day, self.credential, tool, endpoint, units),
+        )
+
+    def reserve(self, endpoint: str, tool: str) -> int:
+        """
+        Charge the cost of one call to the ledger if the budgets allow it.
+
+        Args:
+            endpoint: API resource being called, e.g. "search".
+            tool: Name of the tool making the call.
+
+        Returns:
+            int: Units charged
+
+        Raises:
+            QuotaExceededError: If the call would exceed the credential's daily budget.
+            ToolBudgetExceededError: If the call would exceed the tool's budget.
+        """
+        units = self.cost(endpoint)
+        day = quota_day()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._used(day) + units > self.daily_budget:
+                    raise QuotaExceededError(
+                        f"Daily quota budget of {self.daily_budget} units exhausted "
+                        f"for credential '{self.credential}'"
+                    )
+
+                tool_budget = self.tool_budgets.get(tool)
+                if (
+                    tool_budget is not None
+                    and self._used(day, tool) + units > tool_budget
+                ):
+                    raise ToolBudgetExceededError(
+                        f"Daily quota budget of {tool_budget} units exhausted "
+                        f"for tool '{tool}'"
+                    )
+
+                self._record(day, tool, endpoint, units)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return units
+
+    def remaining(self) -> int:
+        """
+        Units left in today's budget of the credential.
+        """
+        with self._lock:
+            return max(self.daily_budget - self._used(quota_day()), 0)
+
+    def mark_exhausted(self) -> None:
+        """
+        Record that the API reported the quota as exceeded, so further calls fail
+        fast until the quota day rolls over.
+        """
+        day = quota_day()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                units = self.daily_budget - self._used(day)
+                if units > 0:
+                    self._record(day, "(api)", "quotaExceeded", units)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def status(self) -> dict:
+        """
+        Today's usage of the credential, in total and per tool and endpoint.
+        """
+        day = quota_day()
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT tool, endpoint, units, calls FROM quota_usage
+                WHERE day = ? AND credential = ?
+                """,
+                (day, self.credential),
+            ).fetchall()
+
+        used = sum(row[2] for row in rows)
+        tools = {}
+        for tool, endpoint, units, calls in rows:
+            usage = tools.setdefault(
+                tool,
+                {
+                    "used": 0,
+                    "calls": 0,
+                    "budget": self.tool_budgets.get(tool),
+                    "endpoints": {},
+                },
+            )
+            usage["used"] += units
+            usage["calls"] += calls
+            usage["endpoints"][endpoint] = units
+
+        return {
+            "day": day,
+            "credential": self.credential,
+            "daily_budget": self.daily_budget,
+            "used": used,
+            "remaining": max(self.daily_budget - used, 0),
+            "tools": tools,
+        }
@@ -0,0 +1,133 @@
+import json
+import typing
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("json", "columnar", "tsv")
+
+
+def _dumps(data) -> str:
+    """
+    Compact JSON of plain data, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _item_fields(model: BaseModel, items_key: str | None) -> list[str]:
+    if items_key is None:
+        return list(type(model).model_fields)
+
+    annotation = type(model).model_fields[items_key].annotation
+    return list(typing.get_args(annotation)[0].model_fields)
+
+
+def _tsv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif isinstance(value, list):
+        value = ",".join(str(entry) for entry in value)
+
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def render(
+    model: BaseModel,
+    items_key: str | None = None,
+    key: str | None = None,
+    fields: list[str] | None = None,
+    format: str = "json",
+    exclude_none: bool = False,
+    max_description_chars: int | None = None,
+) -> str:
+    """
+    Serialize a tool result, optionally projected and in a compact format.
+
+    Args:
+        model: Result model, e.g. VideoResults, or a single item such as a
+            ChannelInfo.
+        items_key: Field of the model holding the list of items, e.g. "videos".
+            None if the model is a single item.
+        key: Item field that is always kept when selecting fields, e.g. "video_id".
+        fields: Item fields to keep. All fields are kept if not given.
+        format: "json" for the model's JSON, "columnar" for JSON that states the
+            column names once followed by one value list per item, or "tsv" for
+            tab-separated values with a header row.
+        exclude_none: Leave out fields, or columns, that have no value.
+        max_description_chars: Truncate descriptions to this many characters.
+
+    Returns:
+        str: The serialized result
+
+    Raises:
+        ValueError: If the format or a field is unknown.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, use one of {', '.join(FORMATS)}")
+
+    item_fields = _item_fields(model, items_key)
+    include = None
+    if fields:
+        unknown = [name for name in fields if name not in item_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        columns = [name for name in item_fields if name in fields or name == key]
+        if items_key is None:
+            include = set(columns)
+        else:
+            include = {name: True for name in type(model).model_fields}
+            include[items_key] = {"__all__": set(columns)}
+    else:
+        columns = item_fields
+
+    if format == "json" and not max_description_chars:
+        return model.model_dump_json(include=include, exclude_none=exclude_none)
+
+    data = model.model_dump(mode="json", include=include, exclude_none=exclude_none)
+    items = [data] if items_key is None else data[items_key]
+
+    if max_description_chars:
+        for item in items:
+            description = item.get("description")
+            if description and len(description) > max_description_chars:
+                item["description"] = description[:max_description_chars] + "..."
+
+    if format == "json":
+        return _dumps(data)
+
+    if exclude_none:
+        columns = [
+            name
+            for name in columns
+            if any(item.get(name) is not None for item in items)
+        ]
+    rows = [[item.get(name) for name in columns] for item in items]
+    envelope = {} if items_key is None else data
+    envelope = {name: value for name, value in envelope.items() if name != items_key}
+
+    if format == "columnar":
+        return _dumps({**envelope, "columns": columns, "rows": rows})
+
+    lines = [
+        f"# {name}: {_tsv_value(value)}"
+        for name, value in envelope.items()
+        if value not in (None, [])
+    ]
+    lines.append("\t".join(columns))
+    lines.extend("\t".join(_tsv_value(value) for value in row) for row in rows)
+    return "\n".join(lines)
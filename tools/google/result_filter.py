@@ -0,0 +1,412 @@
+import functools
+import heapq
+import itertools
+import operator
+import re
+import typing
+from datetime import datetime, timezone
+from typing import Any, Callable
+from pydantic import BaseModel
+
+# Short names agents tend to use, for model fields with longer names
+FIELD_ALIASES = {
+    "views": "view_count",
+    "likes": "like_count",
+    "comments": "comment_count",
+    "subscribers": "subscriber_count",
+    "videos": "video_count",
+    "title": "video_title",
+    "channel": "channel_title",
+    "published": "published_at",
+}
+
+COMPARISONS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+KEYWORDS = {"and", "or", "not", "between", "contains", "sort", "limit", "true", "false"}
+CLAUSES = {("keyword", "sort"), ("keyword", "limit")}
+NUMBER_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+        |(?P<date>\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2})?(?:Z|[+-]\d{2}:\d{2})?)?)
+        |(?P<number>\d+(?:\.\d+)?[kKmM]?)(?![\w.])
+        |(?P<op>>=|<=|!=|==|=|<|>)
+        |(?P<punct>[,()+-])
+        |(?P<word>\w+)
+    )""",
+    re.VERBOSE,
+)
+
+Predicate = Callable[[Any], bool]
+# Conditions evaluate to None, i.e. unknown, when a compared field is missing
+Condition = Callable[[Any], bool | None]
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Unexpected input at {expression[position:]!r}")
+
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "word" and text.lower() in KEYWORDS:
+            kind, text = "keyword", text.lower()
+        tokens.append((kind, text))
+        position = match.end()
+
+    return tokens
+
+
+class _Descending:
+    """
+    Sort key component that orders its value in reverse.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: "_Descending") -> bool:
+        return self.value == other.value
+
+
+class ResultFilter:
+    """
+    A compiled filter, sort and limit expression over result models.
+
+    Items that fail the filter are dropped as they stream by. With a limit, the
+    top items are picked with a heap instead of sorting every match.
+    """
+
+    def __init__(
+        self,
+        predicate: Predicate | None,
+        sort_keys: list[tuple[str, bool]],
+        limit: int | None,
+        fields: frozenset[str],
+    ) -> None:
+        """
+        Args:
+            predicate: Returns whether an item is kept. None keeps every item.
+            sort_keys: Field names to sort by, each with whether it is sorted in
+                descending order.
+            limit: Maximum number of items to keep.
+            fields: Model fields the expression reads.
+        """
+        self.predicate = predicate
+        self.sort_keys = sort_keys
+        self.limit = limit
+        self.fields = fields
+
+    def _sort_key(self, item) -> tuple:
+        # Items missing a sort field go last, whatever the direction
+        key = []
+        for name, descending in self.sort_keys:
+            value = getattr(item, name, None)
+            key.append(value is None)
+            key.append(_Descending(value) if descending else value)
+        return tuple(key)
+
+    def apply(self, items: list) -> list:
+        """
+        Filter, sort and cut a list of result models.
+        """
+        matches = (
+            iter(items) if self.predicate is None else filter(self.predicate, items)
+        )
+
+        if self.sort_keys:
+            if self.limit is not None:
+                return heapq.nsmallest(self.limit, matches, key=self._sort_key)
+            return sorted(matches, key=self._sort_key)
+
+        if self.limit is not None:
+            return list(itertools.islice(matches, self.limit))
+        return list(matches)
+
+
+def _field_type(model: type[BaseModel], name: str) -> type:
+    """
+    Type of a model field with None and list element types stripped, e.g. int
+    for "int | None" and list for "list[str] | None".
+    """
+    annotation = model.model_fields[name].annotation
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is not list and args:
+        annotation = args[0]
+
+    return typing.get_origin(annotation) or annotation
+
+
+class _Parser:
+    def __init__(self, expression: str, model: type[BaseModel]) -> None:
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.model = model
+        self.fields = set()
+
+    def peek(self, offset: int = 0) -> tuple[str, str] | None:
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return None
+
+    def next(self) -> tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def accept(self, kind: str, text: str | None = None) -> bool:
+        token = self.peek()
+        if token is not None and token[0] == kind and text in (None, token[1]):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind: str, text: str | None = None) -> str:
+        token = self.next()
+        if token[0] != kind or text not in (None, token[1]):
+            raise ValueError(f"Expected {text or kind!r}, got {token[1]!r}")
+        return token[1]
+
+    def field(self) -> str:
+        name = self.expect("word")
+        name = FIELD_ALIASES.get(name, name)
+        if name not in self.model.model_fields:
+            raise ValueError(f"Unknown field {name!r}")
+
+        self.fields.add(name)
+        return name
+
+    def value(self, name: str):
+        kind, text = self.next()
+        field_type = _field_type(self.model, name)
+
+        if field_type in (int, float):
+            if kind != "number":
+                raise ValueError(f"{name} is compared with numbers, got {text!r}")
+            multiplier = NUMBER_SUFFIXES.get(text[-1].lower(), 1)
+            if multiplier > 1:
+                text = text[:-1]
+            return float(text) * multiplier
+
+        if field_type is datetime:
+            if kind == "string":
+                text = text[1:-1]
+            elif kind != "date":
+                raise ValueError(f"{name} is compared with dates, got {text!r}")
+            try:
+                parsed = datetime.fromisoformat(text)
+            except ValueError:
+                raise ValueError(f"Invalid date {text!r}") from None
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed
+
+        if field_type is bool:
+            if kind != "keyword" or text not in ("true", "false"):
+                raise ValueError(f"{name} is compared with true or false, got {text!r}")
+            return text == "true"
+
+        if kind == "string":
+            text = text[1:-1]
+        return text.lower()
+
+    def parse(self) -> ResultFilter:
+        predicate = None
+        if self.peek() is not None and self.peek() not in CLAUSES:
+            condition = self.disjunction()
+
+            # Items only match when the condition is known to hold
+            def predicate(item):
+                return condition(item) is True
+
+        sort_keys, limit = [], None
+        while self.peek() is not None:
+            if predicate is not None or sort_keys or limit is not None:
+                self.expect("punct", ",")
+
+            if self.accept("keyword", "sort"):
+                sort_keys.append(self.sort_key())
+                # Further sort keys follow after commas, until the next clause
+                while self.peek() == ("punct", ",") and self.peek(1) not in CLAUSES:
+                    self.next()
+                    sort_keys.append(self.sort_key())
+            elif self.accept("keyword", "limit"):
+                text = self.expect("number")
+                if not text.isdigit():
+                    raise ValueError(f"Invalid limit {text!r}")
+                limit = int(text)
+            else:
+                raise ValueError(f"Expected sort or limit, got {self.next()[1]!r}")
+
+        return ResultFilter(predicate, sort_keys, limit, frozenset(self.fields))
+
+    def sort_key(self) -> tuple[str, bool]:
+        descending = self.accept("punct", "-")
+        if not descending:
+            self.accept("punct", "+")
+        return self.field(), descending
+
+    # and, or and not follow SQL's three-valued logic, so an unknown condition
+    # stays unknown under not instead of turning into a match
+
+    def disjunction(self) -> Condition:
+        conditions = [self.conjunction()]
+        while self.accept("keyword", "or"):
+            conditions.append(self.conjunction())
+
+        if len(conditions) == 1:
+            return conditions[0]
+
+        def either(item):
+            result = False
+            for condition in conditions:
+                value = condition(item)
+                if value:
+                    return True
+                if value is None:
+                    result = None
+            return result
+
+        return either
+
+    def conjunction(self) -> Condition:
+        conditions = [self.negation()]
+        while self.accept("keyword", "and"):
+            conditions.append(self.negation())
+
+        if len(conditions) == 1:
+            return conditions[0]
+
+        def both(item):
+            result = True
+            for condition in conditions:
+                value = condition(item)
+                if value is False:
+                    return False
+                if value is None:
+                    result = None
+            return result
+
+        return both
+
+    def negation(self) -> Condition:
+        if self.accept("keyword", "not"):
+            condition = self.negation()
+
+            def negated(item):
+                value = condition(item)
+                return None if value is None else not value
+
+            return negated
+
+        if self.accept("punct", "("):
+            condition = self.disjunction()
+            self.expect("punct", ")")
+            return condition
+
+        return self.comparison()
+
+    def comparison(self) -> Condition:
+        name = self.field()
+        field_type = _field_type(self.model, name)
+
+        def value_of(item):
+            value = getattr(item, name, None)
+            if isinstance(value, str):
+                return value.lower()
+            return value
+
+        if self.accept("keyword", "between"):
+            low = self.value(name)
+            self.expect("keyword", "and")
+            high = self.value(name)
+
+            def in_range(item):
+                value = value_of(item)
+                return None if value is None else low <= value <= high
+
+            return in_range
+
+        if self.accept("keyword", "contains"):
+            needle = self.value(name)
+            if field_type is list:
+
+                def has_entry(item):
+                    entries = getattr(item, name, None)
+                    if entries is None:
+                        return None
+                    return any(entry.lower() == needle for entry in entries)
+
+                return has_entry
+            if field_type is not str:
+                raise ValueError(f"contains needs a text or list field, got {name}")
+
+            def has_text(item):
+                value = value_of(item)
+                return None if value is None else needle in value
+
+            return has_text
+
+        op = self.expect("op")
+        if field_type is list:
+            raise ValueError(f"{name} is a list, use contains")
+        compare = COMPARISONS[op]
+        expected = self.value(name)
+
+        def compared(item):
+            value = value_of(item)
+            return None if value is None else compare(value, expected)
+
+        return compared
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(expression: str, model: type[BaseModel]) -> ResultFilter:
+    """
+    Compile a filter, sort and limit expression over result models.
+
+    The expression is a condition followed by optional sort and limit clauses,
+    separated by commas, e.g.
+    "views>=100k and duration_s between 300 and 1200, sort -likes, limit 20".
+
+    Conditions compare a field with =, !=, <, <=, > or >=, test a range with
+    "between ... and ...", or match text and list fields with "contains". They
+    combine with and, or, not and parentheses. Numbers take k and m suffixes,
+    dates are written as 2024-01-31, and text is matched case-insensitively.
+    A condition on a field an item is missing is unknown, and stays unknown
+    under not, so such items never match it.
+
+    Sort takes one or more comma separated fields, each with a leading - for
+    descending order.
+
+    Args:
+        expression: The expression.
+        model: Result item model the field names refer to, e.g. VideoInfo.
+            Short aliases such as views and likes are accepted.
+
+    Returns:
+        ResultFilter: The compiled expression
+
+    Raises:
+        ValueError: If the expression is invalid.
+    """
+    return _Parser(expression, model).parse()
@@ -0,0 +1,151 @@
+import contextlib
+import datetime
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Refresh OAuth tokens this many seconds before they expire
+DEFAULT_REFRESH_MARGIN = 300
+
+
+class TokenRefresher:
+    """
+    Refreshes OAuth credentials in the background well before they expire.
+
+    API calls then always find a valid access token instead of refreshing it in
+    the request path. Refreshes of a credential are serialized by a lock, so
+    concurrent callers that find a token about to expire refresh it only once.
+    Server processes sharing a token file also lock the file, and pick up a
+    token another process already refreshed instead of refreshing it again.
+    """
+
+    def __init__(
+        self, margin: float = DEFAULT_REFRESH_MARGIN, interval: float = 60
+    ) -> None:
+        """
+        Args:
+            margin: Seconds before expiry a token is refreshed.
+            interval: Seconds between background expiry checks.
+        """
+        self.margin = margin
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._entries: dict[int, tuple] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, credentials, token_file: str | None = None) -> None:
+        """
+        Keep a credential fresh, starting the background thread if needed.
+
+        Args:
+            credentials: google.oauth2 Credentials with a refresh token.
+            token_file: Token file the refreshed credential is saved to.
+        """
+        with self._lock:
+            self._entries[id(credentials)] = (
+                credentials,
+                token_file,
+                threading.Lock(),
+            )
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="token-refresher", daemon=True
+                )
+                self._thread.start()
+
+    def _expiring(self, credentials) -> bool:
+        if not credentials.token:
+            return True
+        if credentials.expiry is None:
+            return False
+
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return (credentials.expiry - now).total_seconds() < self.margin
+
+    def ensure_fresh(self, credentials) -> None:
+        """
+        Refresh a credential now if it is about to expire, e.g. because the
+        background thread fell behind while the machine was asleep.
+        """
+        entry = self._entries.get(id(credentials))
+        if entry is not None and self._expiring(credentials):
+            self._refresh(entry)
+
+    def _refresh(self, entry: tuple) -> None:
+        credentials, token_file, lock = entry
+
+        with lock, self._file_lock(token_file):
+            # Another thread or process may have refreshed it while this one waited
+            if token_file:
+                self._load_token(credentials, token_file)
+            if not self._expiring(credentials):
+                return
+
+            from google.auth.transport.requests import Request
+
+            credentials.refresh(Request())
+
+            if token_file:
+                tmp_file = f"{token_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "w") as token:
+                    token.write(credentials.to_json())
+                os.replace(tmp_file, token_file)
+
+    @contextlib.contextmanager
+    def _file_lock(self, token_file: str | None):
+        """
+        Hold an exclusive lock on a token file across processes, where supported.
+        """
+        if not token_file or fcntl is None:
+            yield
+            return
+
+        with open(f"{token_file}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_token(self, credentials, token_file: str) -> None:
+        """
+        Adopt the access token saved in the token file if it expires later.
+        """
+        try:
+            with open(token_file, "r") as token:
+                saved = json.load(token)
+            expiry = datetime.datetime.fromisoformat(saved["expiry"].rstrip("Z"))
+        except (OSError, ValueError, KeyError, AttributeError):
+            return
+
+        expiry = expiry.replace(tzinfo=None)
+        if credentials.expiry is None or expiry > credentials.expiry:
+            credentials.token = saved["token"]
+            credentials.expiry = expiry
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                entries = list(self._entries.values())
+
+            for entry in entries:
+                if entry[0].refresh_token and self._expiring(entry[0]):
+                    try:
+                        self._refresh(entry)
+                    except Exception:
+                        # Retried on the next check, or by ensure_fresh
+                        pass
+
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class TranscriptStore:
+    """
+    On-disk store of Youtube transcripts keyed by video ID and language.
+
+    Segment lists are stored zlib-compressed in content-addressed blob files named
+    after the SHA-256 of their contents, so identical transcripts share one blob.
+    An SQLite index maps keys to blobs and tracks access times for LRU eviction.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Args:
+            root: Directory holding the index and the blob files.
+            max_bytes: Maximum total size of the stored blobs.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            os.path.join(root, "index.sqlite3"), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                video_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (video_id, language)
+            );
+            CREATE INDEX IF NOT EXISTS transcripts_last_access
+                ON transcripts (last_access);
+            CREATE INDEX IF NOT EXISTS transcripts_digest ON transcripts (digest);
+            """
+        )
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def get(self, video_id: str, language: str) -> list[dict] | None:
+        """
+        Get a stored transcript.
+
+        Args:
+            video_id: Youtube Video ID.
+            language: Transcript language code.
+
+        Returns:
+            list[dict]: Transcript segments, or None if the transcript is not stored
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT digest FROM transcripts WHERE video_id = ? AND language = ?",
+                (video_id, language),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE transcripts SET last_access = ? WHERE video_id = ? AND language = ?",
+                (time.time(), video_id, language),
+            )
+
+        try:
+            with open(self._blob_path(row[0]), "rb") as blob:
+                return json.loads(zlib.decompress(blob.read()))
+        except FileNotFoundError:
+            return None
+
+    def put(self, video_id: str, language: str, segments: list[dict]) -> None:
+        """
+        Store a transcript, evicting the least recently used ones if the store
+        grows beyond its size cap.
+
+        Args:
+            video_id: Youtube Video ID.
+            language: Transcript language code.
+            segments: Transcript segments as returned by YouTubeTranscriptApi.
+        """
+        data = zlib.compress(
+            json.dumps(segments, separators=(",", ":")).encode("utf-8")
+        )
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as blob:
+                blob.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                (video_id, language, digest, len(data), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used transcripts until the stored blobs fit in
+        max_bytes. Must be called with the lock held inside a transaction.
+        """
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT digest, MAX(size) AS size FROM transcripts GROUP BY digest)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT video_id, language, digest, size FROM transcripts ORDER BY last_access"
+        ).fetchall()
+        for video_id, language, digest, size in rows:
+            if total <= self.max_bytes:
+                break
+
+            self._conn.execute(
+                "DELETE FROM transcripts WHERE video_id = ? AND language = ?",
+                (video_id, language),
+            )
+            shared = self._conn.execute(
+                "SELECT 1 FROM transcripts WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if shared is None:
+                total -= size
+                try:
+                    os.remove(self._blob_path(digest))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,90 @@
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+# youtube_transcript_api fetches every transcript from the watch page host
+TRANSCRIPT_HOST = "www.youtube.com"
+
+
+class HostLimiter:
+    """
+    Per-host politeness limits for outgoing requests.
+
+    Caps the number of requests in flight to each host and spaces out the
+    start of consecutive requests to the same host.
+    """
+
+    def __init__(self, max_concurrent: int = 4, min_interval: float = 0.2) -> None:
+        """
+        Args:
+            max_concurrent: Maximum number of requests in flight per host.
+            min_interval: Minimum seconds between request starts per host.
+        """
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_start: dict[str, float] = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str):
+        """
+        Hold a request slot for a host while the request runs.
+        """
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_concurrent)
+        )
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        async with semaphore:
+            async with lock:
+                wait = self._last_start.get(host, 0.0) + self.min_interval
+                wait -= time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_start[host] = time.monotonic()
+
+            yield
+
+
+async def download_many(
+    video_ids: list[str],
+    fetch: Callable[[str], Awaitable[str]],
+    parallelism: int = 8,
+    limiter: HostLimiter | None = None,
+    host: str = TRANSCRIPT_HOST,
+) -> AsyncIterator[dict]:
+    """
+    Download many transcripts concurrently, yielding results as they complete.
+
+    A failed download is yielded as an error result and does not affect the
+    other videos of the batch.
+
+    Args:
+        video_ids: Youtube Video IDs to download.
+        fetch: Coroutine function downloading the transcript of one video.
+        parallelism: Maximum number of downloads running at the same time.
+        limiter: Per-host politeness limits, shared between batches.
+        host: Host the downloads are made to.
+
+    Yields:
+        dict: {"video_id", "transcript"} or {"video_id", "error"}
+    """
+    limiter = limiter or HostLimiter()
+    semaphore = asyncio.Semaphore(parallelism)
+
+    async def download(video_id):
+        async with semaphore, limiter.slot(host):
+            try:
+                return {"video_id": video_id, "transcript": await fetch(video_id)}
+            except Exception as e:
+                return {"video_id": video_id, "error": str(e)}
+
+    tasks = [asyncio.create_task(download(video_id)) for video_id in video_ids]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,50 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class WorkerPool:
+    """
+    Bounded thread pool that runs blocking tool functions off the event loop.
+
+    googleapiclient and youtube_transcript_api block on network I/O, so running
+    them directly in an MCP tool stalls every other request the server is
+    handling. Tools wrapped by the pool run in worker threads instead and
+    concurrent tool calls overlap.
+    """
+
+    def __init__(self, max_workers: int = 16) -> None:
+        """
+        Args:
+            max_workers: Maximum number of tool calls running at the same time.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tool-worker"
+        )
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking function in the pool and await its result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def wrap(self, func):
+        """
+        Return an async variant of a blocking function that runs in the pool.
+
+        The wrapper keeps the signature and docstring of the wrapped function, so
+        it can be registered as an MCP tool in its place.
+        """
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.run(func, *args, **kwargs)
+
+        return wrapper
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,102 @@
+import os
 import re
 import json
-from googleapiclient.discovery import Resource
-from pydantic import BaseModel, Field
-from tools.google.google_apis import create_service
+import math
+import base64
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Annotated, Callable
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter
+from tools.google.entity_cache import EntityCache
+from tools.google.rendering import render
+from tools.google.result_filter import compile_filter
+from tools.google.field_masks import (
+    PAGE_ENVELOPE,
+    field_reader,
+    fields_mask,
+    model_from_item,
+    parts_for_fields,
+    source_paths,
+)
+from tools.google.batching import BatchLoader
+from tools.google.catalog import Catalog
+from tools.google.credential_pool import CredentialPool, PooledCredential
+from tools.google.execution import (
+    RATE_LIMIT_REASONS,
+    RETRYABLE_STATUSES,
+    RetryPolicy,
+    SingleFlight,
+    TokenBucket,
+    request_key,
+    retry_after_seconds,
+)
+from tools.google.quota import (
+    DEFAULT_DAILY_QUOTA,
+    QuotaExceededError,
+    QuotaLedger,
+    ToolBudgetExceededError,
+)
+from tools.google.token_refresh import TokenRefresher
+
+# The Google API client is imported on first use of the Data API, so sessions
+# that only download transcripts never pay for it
+if TYPE_CHECKING:
+    import httplib2
+    from googleapiclient.discovery import Resource
+    from googleapiclient.errors import HttpError
+
+# videos().list and channels().list accept at most 50 comma-joined IDs per call
+MAX_IDS_PER_REQUEST = 50
+
+VIDEO_PARTS = [
+    "snippet",
+    "contentDetails",
+    "statistics",
+    "paidProductPlacementDetails",
+    "topicDetails",
+]
+CHANNEL_PARTS = ["snippet", "statistics"]
+
+# search.list stops paginating at about 500 results per query
+SEARCH_RESULT_CAP = 500
+MIN_FAN_OUT_WINDOW = timedelta(minutes=1)
+YOUTUBE_LAUNCH = datetime(2005, 4, 23, tzinfo=timezone.utc)
+
+VIDEO_ID = re.compile(r"[A-Za-z0-9_-]{11}")
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com"}
+# URL paths that carry the video ID as their second segment, e.g. /shorts/<id>
+VIDEO_ID_PATHS = {"shorts", "embed", "live", "v"}
+
+# ISO 8601 durations as returned in contentDetails.duration, e.g. "PT1H2M3S"
+ISO_DURATION = re.compile(
+    r"P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?"
+)
+DURATION_UNITS = (7 * 86400, 86400, 3600, 60, 1)
+
+
+def parse_duration(value: str | int | None) -> int | None:
+    """
+    Parse an ISO 8601 duration such as "PT1H2M3S" into seconds.
+
+    Values that are not strings are returned as is. Durations that cannot be
+    parsed become None.
+    """
+    if not isinstance(value, str):
+        return value
+
+    match = ISO_DURATION.fullmatch(value)
+    if match is None:
+        return None
+
+    return sum(
+        int(amount) * unit
+        for amount, unit in zip(match.groups(), DURATION_UNITS)
+        if amount
+    )
 
 
 class PlaylistInfo(BaseModel):
@@ -10,28 +104,30 @@ class PlaylistInfo(BaseModel):
     playlist_title: str = Field(..., description="Playlist Title")
     channel_id: str = Field(..., description="Channel ID")
     description: str = Field(..., description="Playlist Description")
-    published_at: str = Field(..., description="Playlist Published Time")
+    published_at: datetime = Field(..., description="Playlist Published Time")
 
 
 class PlaylistResults(BaseModel):
     total_results: int = Field(..., description="Total Number of Results")
     playlists: list[PlaylistInfo] = Field(..., description="Playlist Information")
+    next_cursor: str | None = Field(None, description="Cursor of the Next Page")
 
 
 class ChannelInfo(BaseModel):
     channel_id: str = Field(..., description="Channel ID")
     channel_title: str = Field(..., description="Channel Title")
     description: str = Field(..., description="Channel Description")
-    published_at: str = Field(..., description="Channel Published Time")
-    country: str = Field(..., description="Channel Country")
-    view_count: str = Field(..., description="View Count")
-    subscriber_count: str = Field(..., description="Subscriber Count")
-    video_count: str = Field(..., description="Video Count")
+    published_at: datetime = Field(..., description="Channel Published Time")
+    country: str | None = Field(None, description="Channel Country")
+    view_count: int | None = Field(None, description="View Count")
+    subscriber_count: int | None = Field(None, description="Subscriber Count")
+    video_count: int | None = Field(None, description="Video Count")
 
 
 class ChannelResults(BaseModel):
     total_results: int = Field(..., description="Total Number of Results")
     channels: list[ChannelInfo] = Field(..., description="Channel Information")
+    next_cursor: str | None = Field(None, description="Cursor of the Next Page")
 
 
 class VideoInfo(BaseModel):
@@ -40,17 +136,20 @@ class VideoInfo(BaseModel):
     video_id: str = Field(..., description="Video ID")
     video_title: str = Field(..., description="Video Title")
     description: str = Field(..., description="Channel Description")
-    published_at: str = Field(..., description="Channel Published Time")
+    published_at: datetime = Field(..., description="Video Published Time")
 
     # Additional Information
-    tags: list[str] = Field(None, description="Video Tags")
-    duration: str = Field(None, description="Video Duration")
-    dimension: str = Field(None, description="Video Dimension")
-    view_count: str = Field(None, description="Video Count")
-    like_count: str = Field(None, description="Like Count")
-    comment_report: str = Field(None, description="Comment Count")
-    topic_categories: str = Field(None, description="Topic Categories")
-    has_paid_product_placement: str = Field(
+    tags: list[str] | None = Field(None, description="Video Tags")
+    duration: str | None = Field(None, description="Video Duration")
+    duration_s: Annotated[int | None, BeforeValidator(parse_duration)] = Field(
+        None, description="Video Duration in Seconds"
+    )
+    dimension: str | None = Field(None, description="Video Dimension")
+    view_count: int | None = Field(None, description="View Count")
+    like_count: int | None = Field(None, description="Like Count")
+    comment_count: int | None = Field(None, description="Comment Count")
+    topic_categories: list[str] | None = Field(None, description="Topic Categories")
+    has_paid_product_placement: bool | None = Field(
         None, description="Has Paid Product Placement"
     )
 
@@ -58,6 +157,170 @@ class VideoInfo(BaseModel):
 class VideoResults(BaseModel):
     total_results: int = Field(..., description="Total Number of Results")
     videos: list[VideoInfo] = Field(..., description="Video Information")
+    not_found: list[str] = Field(
+        default_factory=list, description="Requested Video IDs that were not found"
+    )
+    next_cursor: str | None = Field(None, description="Cursor of the Next Page")
+
+
+# Response field each model field is read from, with fallbacks as tuples. Field
+# masks of the list() calls are built from these, so only consumed fields are
+# downloaded.
+VIDEO_SOURCES = {
+    "channel_id": "snippet.channelId",
+    "channel_title": "snippet.channelTitle",
+    "video_id": "id",
+    "video_title": "snippet.title",
+    "description": "snippet.description",
+    "published_at": "snippet.publishedAt",
+    "tags": "snippet.tags",
+    "duration": "contentDetails.duration",
+    "duration_s": "contentDetails.duration",
+    "dimension": "contentDetails.dimension",
+    "view_count": "statistics.viewCount",
+    "like_count": "statistics.likeCount",
+    "comment_count": "statistics.commentCount",
+    "topic_categories": "topicDetails.topicCategories",
+    "has_paid_product_placement": "paidProductPlacementDetails.hasPaidProductPlacement",
+}
+CHANNEL_SOURCES = {
+    "channel_id": "id",
+    "channel_title": "snippet.title",
+    "description": "snippet.description",
+    "published_at": "snippet.publishedAt",
+    "country": "snippet.country",
+    "view_count": "statistics.viewCount",
+    "subscriber_count": "statistics.subscriberCount",
+    "video_count": "statistics.videoCount",
+}
+# Values of fields whose source is missing from a full response item
+VIDEO_DEFAULTS = {
+    "description": "",
+    "tags": [],
+    "topic_categories": [],
+    "has_paid_product_placement": False,
+}
+ENTITY_SOURCES = {
+    "videos": (VideoInfo, VIDEO_SOURCES),
+    "channels": (ChannelInfo, CHANNEL_SOURCES),
+}
+
+SEARCH_SOURCES = {
+    "video": (
+        VideoInfo,
+        {
+            "channel_id": "snippet.channelId",
+            "channel_title": "snippet.channelTitle",
+            "video_id": "id.videoId",
+            "video_title": "snippet.title",
+            "description": "snippet.description",
+            "published_at": ("snippet.publishTime", "snippet.publishedAt"),
+        },
+    ),
+    "channel": (
+        ChannelInfo,
+        {
+            "channel_id": "id.channelId",
+            "channel_title": "snippet.title",
+            "description": "snippet.description",
+            "published_at": "snippet.publishedAt",
+        },
+    ),
+    "playlist": (
+        PlaylistInfo,
+        {
+            "playlist_id": "id.playlistId",
+            "playlist_title": "snippet.title",
+            "channel_id": "snippet.channelId",
+            "description": "snippet.description",
+            "published_at": "snippet.publishedAt",
+        },
+    ),
+}
+SEARCH_FIELDS = {
+    kind: fields_mask(source_paths(model, sources), PAGE_ENVELOPE)
+    for kind, (model, sources) in SEARCH_SOURCES.items()
+}
+
+UPLOAD_SOURCES = {
+    "channel_id": ("snippet.videoOwnerChannelId", "snippet.channelId"),
+    "channel_title": ("snippet.videoOwnerChannelTitle", "snippet.channelTitle"),
+    "video_id": "snippet.resourceId.videoId",
+    "video_title": "snippet.title",
+    "description": "snippet.description",
+    "published_at": ("contentDetails.videoPublishedAt", "snippet.publishedAt"),
+}
+UPLOAD_DEFAULTS = {"description": ""}
+UPLOAD_FIELDS = fields_mask(source_paths(VideoInfo, UPLOAD_SOURCES), PAGE_ENVELOPE)
+
+# Validate whole pages of field dicts in one call instead of one model at a time
+VIDEO_LIST = TypeAdapter(list[VideoInfo])
+CHANNEL_LIST = TypeAdapter(list[ChannelInfo])
+PLAYLIST_LIST = TypeAdapter(list[PlaylistInfo])
+
+# Model field dicts of list() response items, read from the sources above, so
+# each builder only reads paths its field mask selects.
+# Items of channels().list
+channel_fields = field_reader(CHANNEL_SOURCES)
+# Items of videos().list
+video_fields = field_reader(VIDEO_SOURCES, VIDEO_DEFAULTS)
+# Items of search().list, by result type
+channel_search_fields = field_reader(SEARCH_SOURCES["channel"][1])
+video_search_fields = field_reader(SEARCH_SOURCES["video"][1])
+playlist_search_fields = field_reader(SEARCH_SOURCES["playlist"][1])
+# Items of playlistItems().list of an uploads playlist
+upload_fields = field_reader(UPLOAD_SOURCES, UPLOAD_DEFAULTS)
+
+# Local catalog tables: stored model, key field and indexed fields
+CATALOG_TABLES = {
+    "videos": (VideoInfo, "video_id", ["channel_id", "published_at", "view_count"]),
+    "channels": (ChannelInfo, "channel_id", ["subscriber_count"]),
+    "playlists": (PlaylistInfo, "playlist_id", ["channel_id"]),
+}
+
+
+class ToolQuotaUsage(BaseModel):
+    used: int = Field(..., description="Units Used Today")
+    calls: int = Field(..., description="API Calls Made Today")
+    budget: int | None = Field(None, description="Daily Unit Budget of the Tool")
+    endpoints: dict[str, int] = Field(..., description="Units Used per Endpoint")
+
+
+class QuotaStatus(BaseModel):
+    day: str = Field(..., description="Quota Day (Pacific Time)")
+    credential: str = Field(..., description="Credential Name")
+    daily_budget: int = Field(..., description="Daily Unit Budget")
+    used: int = Field(..., description="Units Used Today")
+    remaining: int = Field(..., description="Units Remaining Today")
+    tools: dict[str, ToolQuotaUsage] = Field(..., description="Usage per Tool")
+    cooling_down: bool = Field(False, description="Rate Limited Recently")
+
+
+class QuotaReport(BaseModel):
+    used: int = Field(..., description="Units Used Today by All Credentials")
+    remaining: int = Field(..., description="Units Remaining Today for All Credentials")
+    credentials: list[QuotaStatus] = Field(..., description="Usage per Credential")
+
+
+class CatalogRows(BaseModel):
+    columns: list[str] = Field(..., description="Column Names")
+    rows: list[list] = Field(..., description="Rows, One Value per Column")
+    truncated: bool = Field(..., description="More Rows Matched than Returned")
+
+
+class RequestStats(BaseModel):
+    batches: int = Field(..., description="Batched List Calls Sent")
+    keys: int = Field(..., description="IDs Loaded in Batches")
+    shared_keys: int = Field(..., description="IDs Shared with an Open Batch")
+    average_batch_size: float = Field(..., description="Average IDs per Batch")
+    batch_size_histogram: dict[str, int] = Field(
+        ..., description="Number of Batches per Size Bucket"
+    )
+    window_ms: float = Field(..., description="Batching Window in Milliseconds")
+    max_batch_size: int = Field(..., description="Maximum IDs per Batch")
+    coalesced_requests: int = Field(
+        ..., description="Requests Served by an Identical In-flight Request"
+    )
 
 
 def extract_video_id(input_str: str) -> str | None:
@@ -71,21 +334,197 @@ def extract_video_id(input_str: str) -> str | None:
         str: Extracted Youtube Video ID
     """
 
-    url_pattern = re.compile(
-        r"(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})"
-    )
-    match = url_pattern.match(input_str)
+    input_str = input_str.strip()
+    if VIDEO_ID.fullmatch(input_str):
+        return input_str
 
-    if match:
-        return match.group(1)
+    if "://" not in input_str:
+        input_str = "https://" + input_str
+    try:
+        url = urlsplit(input_str)
+        host = (url.hostname or "").lower()
+    except ValueError:
+        return None
+
+    segments = url.path.split("/")
+    video_id = ""
+    if host == "youtu.be" and len(segments) > 1:
+        video_id = segments[1]
+    elif host in YOUTUBE_HOSTS:
+        if url.path == "/watch":
+            video_id = parse_qs(url.query).get("v", [""])[0]
+        elif len(segments) > 2 and segments[1] in VIDEO_ID_PATHS:
+            video_id = segments[2]
+
+    return video_id if VIDEO_ID.fullmatch(video_id) else None
 
-    id_pattern = re.compile(r"^[a-zA-Z0-9_-]{11}")
-    if id_pattern.match(input_str):
-        return input_str
+
+def service_credentials(service: "Resource"):
+    """
+    OAuth credentials a service was built with, or None for API key services.
+    """
+    import google_auth_httplib2
+
+    if isinstance(service._http, google_auth_httplib2.AuthorizedHttp):
+        return service._http.credentials
 
     return None
 
 
+def http_error_reason(error: "HttpError") -> str:
+    """
+    Extract the reason code, e.g. "quotaExceeded", from an API HttpError.
+    """
+    try:
+        return json.loads(error.content)["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ""
+
+
+def parse_video_ids(video_ids: str | list[str]) -> list[str]:
+    """
+    Canonicalize Youtube Video IDs and URLs into a list of unique video IDs.
+
+    Args:
+        video_ids: A list of IDs/URLs, or a free-text string of IDs/URLs separated
+            by commas or whitespace.
+
+    Returns:
+        list[str]: Unique video IDs in the order they first appear
+    """
+
+    if isinstance(video_ids, str):
+        video_ids = re.split(r"[\s,]+", video_ids)
+
+    unique_ids = {}
+    for token in video_ids:
+        video_id = extract_video_id(token.strip())
+        if video_id:
+            unique_ids.setdefault(video_id, None)
+
+    return list(unique_ids)
+
+
+def encode_cursor(tool: str, query: dict, page_token: str) -> str:
+    """
+    Encode the continuation of a search into an opaque cursor.
+
+    Args:
+        tool: Name of the tool the cursor is issued by.
+        query: Normalized search.list parameters of the search.
+        page_token: pageToken of the next page.
+    """
+    payload = json.dumps(
+        {"tool": tool, "query": query, "page_token": page_token},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(tool: str, cursor: str, params: dict) -> tuple[dict, str]:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Cursors are user-editable, so the decoded search must have the same shape
+    as the searches the tool makes itself.
+
+    Args:
+        tool: Name of the tool the cursor is passed to.
+        cursor: The cursor.
+        params: search.list parameters the tool sets. The cursor may only hold
+            these parameters, and must search for the same type of result.
+
+    Returns:
+        tuple: The search.list parameters and the pageToken of the next page
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued by another tool.
+    """
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        issued_by = payload["tool"]
+        query, page_token = payload["query"], payload["page_token"]
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+    if issued_by != tool:
+        raise ValueError(f"Cursor was issued by {issued_by!r}")
+    if not isinstance(query, dict) or not isinstance(page_token, str):
+        raise ValueError("Invalid cursor: malformed search")
+
+    unknown = query.keys() - params.keys()
+    if unknown:
+        raise ValueError(
+            f"Invalid cursor: unexpected search parameters {', '.join(sorted(unknown))}"
+        )
+    if not all(isinstance(value, (str, int)) for value in query.values()):
+        raise ValueError("Invalid cursor: malformed search parameters")
+    if query.get("type") != params.get("type"):
+        raise ValueError(f"Invalid cursor: not a {params.get('type')} search")
+
+    return query, page_token
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """
+    Parse an RFC 3339 timestamp such as "2024-01-01T00:00:00Z".
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
+
+
+def parse_date_range(
+    published_after: str | None, published_before: str | None
+) -> tuple[datetime, datetime]:
+    """
+    Parse the date range of a fanned out search.
+
+    Args:
+        published_after: Start of the range, defaults to Youtube's launch.
+        published_before: End of the range, defaults to now.
+
+    Returns:
+        tuple: The start and end of the range
+
+    Raises:
+        ValueError: If a date is not an RFC 3339 timestamp, or the range is empty.
+    """
+    dates = []
+    for name, value, default in (
+        ("published_after", published_after, YOUTUBE_LAUNCH),
+        ("published_before", published_before, None),
+    ):
+        if not value:
+            dates.append(default or datetime.now(timezone.utc))
+            continue
+        try:
+            dates.append(parse_rfc3339(value))
+        except ValueError:
+            raise ValueError(
+                f"{name} must be an RFC 3339 timestamp such as "
+                f"2024-01-01T00:00:00Z, got {value!r}"
+            ) from None
+
+    start, end = dates
+    if start >= end:
+        raise ValueError("published_after must be before published_before")
+
+    return start, end
+
+
+def format_rfc3339(value: datetime) -> str:
+    """
+    Format a datetime as an RFC 3339 UTC timestamp accepted by the API.
+    """
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 class YoutubeTool:
     """
     Toolkit for interacting with Youtube Data API
@@ -94,59 +533,542 @@ class YoutubeTool:
     API_NAME = "youtube"
     API_VERSION = "v3"
     SCOPES = ["https://www.googleapis.com/auth/youtube.readonly"]
+    MAX_FETCH_WORKERS = 8
+    FAN_OUT_CONCURRENCY = 8
 
-    def __init__(self, client_secret: str) -> None:
+    def __init__(
+        self,
+        client_secret: str,
+        cache_dir: str = "cache_files",
+        daily_quota: int = DEFAULT_DAILY_QUOTA,
+        tool_budgets: dict[str, int] | None = None,
+        token_prefixes: list[str] = ("",),
+        api_keys: list[str] = (),
+        requests_per_second: float = 10.0,
+        batch_window: float = 0.005,
+        max_batch_size: int = MAX_IDS_PER_REQUEST,
+    ) -> None:
+        """
+        Args:
+            client_secret: Path to client secret JSON file.
+            cache_dir: Folder for the entity cache, quota ledger and local
+                catalog.
+            daily_quota: Quota units each credential may spend per day.
+            tool_budgets: Quota units each tool method may spend per day.
+            token_prefixes: Token file prefixes of the OAuth credentials to pool.
+            api_keys: API keys to pool, e.g. from other API projects.
+            requests_per_second: Maximum rate of API requests.
+            batch_window: Seconds to collect video/channel IDs from concurrent
+                calls into one batch.
+            max_batch_size: Maximum number of IDs per batch, at most 50.
+        """
         self.client_secret = client_secret
-        self._init_youtube_service()
+        self.cache_dir = cache_dir
+        self.daily_quota = daily_quota
+        self.tool_budgets = tool_budgets
+        self.token_prefixes = token_prefixes
+        self.api_keys = api_keys
+        self.cache = EntityCache(os.path.join(cache_dir, "entities.sqlite3"))
+        self.catalog = Catalog(
+            os.path.join(cache_dir, "catalog.sqlite3"), CATALOG_TABLES
+        )
+        self.retry_policy = RetryPolicy()
+        self.rate_limiter = TokenBucket(rate=requests_per_second)
+        self.single_flight = SingleFlight()
+        self._local = threading.local()
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=self.MAX_FETCH_WORKERS, thread_name_prefix="youtube-fetch"
+        )
+        self.loader = BatchLoader(
+            self._load_batch,
+            self._fetch_executor,
+            window=batch_window,
+            max_batch_size=min(max_batch_size, MAX_IDS_PER_REQUEST),
+        )
+        self.token_refresher = TokenRefresher()
+        self._pool = None
+        self._pool_lock = threading.RLock()
+
+    @property
+    def pool(self) -> CredentialPool:
+        """
+        The credential pool, built on first use.
+
+        Building the services may run the OAuth consent flow, so it is deferred
+        until the first Data API call instead of slowing down server startup.
+        """
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._init_youtube_service()
+
+        return self._pool
+
+    @property
+    def service(self) -> "Resource":
+        return self.pool.credentials[0].service
 
     def _init_youtube_service(self):
         """
-        Initialize the Youtube Data API service.
+        Initialize the Youtube Data API services, one per pooled credential.
         """
-        self.service = create_service(
-            self.client_secret, self.API_NAME, self.API_VERSION, self.SCOPES
+        from googleapiclient.discovery import build_from_document
+        from tools.google.google_apis import (
+            create_service,
+            get_discovery_document,
+            token_file_path,
         )
-        if not self.service:
-            raise Exception("Failed to create Youtube Service")
 
+        services = {}
+        for prefix in self.token_prefixes:
+            service = create_service(
+                self.client_secret,
+                self.API_NAME,
+                self.API_VERSION,
+                self.SCOPES,
+                prefix=prefix,
+            )
+            if not service:
+                raise Exception(f"Failed to create Youtube Service for '{prefix}'")
+            services[f"oauth{prefix}"] = service
+
+            credentials = service_credentials(service)
+            if credentials is not None:
+                self.token_refresher.add(
+                    credentials,
+                    token_file_path(self.API_NAME, self.API_VERSION, prefix),
+                )
+
+        for i, api_key in enumerate(self.api_keys):
+            services[f"api_key_{i + 1}"] = build_from_document(
+                get_discovery_document(self.API_NAME, self.API_VERSION),
+                developerKey=api_key,
+            )
+
+        self._init_pool(services)
         return self.service
 
-    def get_channel_info(self, channel_id: str) -> str:
+    def _init_pool(self, services: dict[str, "Resource"]) -> None:
+        """
+        Build the credential pool, giving every service its own quota ledger.
+
+        Args:
+            services: Youtube services keyed by credential name.
+        """
+        self._pool = CredentialPool(
+            [
+                PooledCredential(
+                    name,
+                    service,
+                    QuotaLedger(
+                        os.path.join(self.cache_dir, "quota.sqlite3"),
+                        daily_budget=self.daily_quota,
+                        tool_budgets=self.tool_budgets,
+                        credential=name,
+                    ),
+                )
+                for name, service in services.items()
+            ],
+            path=os.path.join(self.cache_dir, "quota.sqlite3"),
+        )
+
+    def _thread_http(self, credential: PooledCredential) -> "httplib2.Http":
+        """
+        Return the current thread's HTTP client for a pooled credential.
+
+        httplib2 is not thread-safe, so every thread that executes requests gets
+        its own client authorized with the credential.
+        """
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+
+        http = clients.get(credential.name)
+        if http is None:
+            import google_auth_httplib2
+            from googleapiclient.http import build_http
+
+            credentials = service_credentials(credential.service)
+            if credentials is None:
+                http = build_http()
+            else:
+                http = google_auth_httplib2.AuthorizedHttp(
+                    credentials, http=build_http()
+                )
+            clients[credential.name] = http
+
+        return http
+
+    def _list(self, resource: str, tool: str, **params) -> dict:
+        """
+        Execute a list() call on a Youtube Data API resource.
+
+        Concurrent identical calls, with the same resource and parameters, are
+        coalesced into one request whose response they all share.
+
+        Args:
+            resource: Name of the API resource, e.g. "videos" or "search".
+            tool: Name of the tool the call is made for.
+            params: Parameters passed to the resource's list() method.
+
+        Returns:
+            dict: The API response
+
+        Raises:
+            QuotaExceededError: If no credential has quota left for the call.
+        """
+        return self.single_flight.do(
+            request_key(resource, params),
+            lambda: self._send(resource, tool, params),
+        )
+
+    def _send(self, resource: str, tool: str, params: dict) -> dict:
+        """
+        Send a list() call, retrying failures.
+
+        Every call waits for the rate limiter before it is sent. Rate limit
+        errors, transient server errors and connection errors are retried with
+        jittered exponential backoff, honoring Retry-After, and rate limit errors
+        also slow the limiter down.
+        """
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        for attempt in range(self.retry_policy.max_attempts):
+            last_attempt = attempt + 1 == self.retry_policy.max_attempts
+            self.rate_limiter.acquire()
+
+            try:
+                response = self._execute(resource, tool, params)
+            except HttpError as e:
+                retry_after = None
+                if e.resp.status == 429 or http_error_reason(e) in RATE_LIMIT_REASONS:
+                    self.rate_limiter.on_rate_limited()
+                    retry_after = retry_after_seconds(e.resp.get("retry-after"))
+                elif e.resp.status not in RETRYABLE_STATUSES:
+                    raise
+
+                if last_attempt:
+                    raise
+                time.sleep(self.retry_policy.delay(attempt, retry_after))
+            except (httplib2.HttpLib2Error, OSError):
+                if last_attempt:
+                    raise
+                time.sleep(self.retry_policy.delay(attempt))
+            else:
+                self.rate_limiter.on_success()
+                return response
+
+    def _execute(self, resource: str, tool: str, params: dict) -> dict:
+        """
+        Send one list() call through the credential pool.
+
+        The call goes to the pooled credential with the most quota left, after
+        charging its cost to that credential's ledger. It fails over to the
+        next credential when a budget is exhausted or the API reports
+        quotaExceeded or a rate limit.
+        """
+        from googleapiclient.errors import HttpError
+
+        http_error = None
+        quota_error = None
+
+        for credential in self.pool.candidates():
+            try:
+                credential.quota.reserve(resource, tool)
+            except ToolBudgetExceededError:
+                raise
+            except QuotaExceededError as e:
+                quota_error = e
+                continue
+
+            credentials = service_credentials(credential.service)
+            if credentials is not None:
+                self.token_refresher.ensure_fresh(credentials)
+
+            request = getattr(credential.service, resource)().list(**params)
+            try:
+                return request.execute(http=self._thread_http(credential))
+            except HttpError as e:
+                reason = http_error_reason(e)
+                if reason == "quotaExceeded":
+                    credential.quota.mark_exhausted()
+                elif reason in RATE_LIMIT_REASONS or e.resp.status == 429:
+                    self.pool.cool_down(credential)
+                else:
+                    raise
+                http_error = e
+
+        if http_error is not None:
+            raise http_error
+        raise QuotaExceededError(f"No credential has quota left: {quota_error}")
+
+    def _get_entities(
+        self, resource: str, tool: str, ids: list[str], parts: list[str]
+    ) -> dict[str, dict]:
+        """
+        Fetch videos or channels by ID, serving fresh parts from the entity cache.
+
+        Only the missing or stale parts of each entity are requested and merged
+        with the cached parts. Requests go through the batch loader, so IDs
+        asked for by concurrent tool calls share videos/channels list() calls of
+        up to 50 IDs.
+
+        Args:
+            resource: "videos" or "channels".
+            tool: Name of the tool the entities are fetched for.
+            ids: Unique entity IDs.
+            parts: API parts to return for every entity.
+
+        Returns:
+            dict: Entity ID to list() response item, for the entities that exist
+        """
+        return self._submit_entities(resource, tool, ids, parts)()
+
+    def _submit_entities(
+        self, resource: str, tool: str, ids: list[str], parts: list[str]
+    ) -> Callable[[], dict[str, dict]]:
+        """
+        Start fetching videos or channels like _get_entities, without waiting.
+
+        Returns:
+            Callable: Waits for the fetch and returns entity ID to list()
+                response item, for the entities that exist
+        """
+        cached = self.cache.get(resource, ids, parts)
+
+        # Group IDs by the parts they are missing so each batch asks for no more
+        # than it needs.
+        groups = {}
+        for entity_id in ids:
+            missing = tuple(
+                part for part in parts if part not in cached.get(entity_id, {})
+            )
+            if missing:
+                groups.setdefault(missing, []).append(entity_id)
+
+        pending = {
+            missing: self.loader.submit((resource, missing), group, tool)
+            for missing, group in groups.items()
+        }
+
+        def collect() -> dict[str, dict]:
+            for missing, futures in pending.items():
+                for entity_id, future in futures.items():
+                    item = future.result()
+                    if item is not None:
+                        cached.setdefault(entity_id, {}).update(
+                            {part: item.get(part) for part in missing}
+                        )
+
+            items = {}
+            for entity_id in ids:
+                entity_parts = cached.get(entity_id, {})
+                if all(part in entity_parts for part in parts):
+                    items[entity_id] = {"id": entity_id}
+                    items[entity_id].update(
+                        {
+                            part: payload
+                            for part, payload in entity_parts.items()
+                            if payload is not None
+                        }
+                    )
+
+            return items
+
+        return collect
+
+    def _load_batch(self, group: tuple[str, tuple], ids: list[str], tool: str) -> dict:
+        """
+        Batch function of the loader: fetch parts of up to 50 entities in one
+        list() call and store them in the entity cache.
+
+        Args:
+            group: Resource name and the parts to fetch.
+            ids: Entity IDs.
+            tool: Name of the tool the batch is charged to.
+
+        Returns:
+            dict: Entity ID to list() response item
+        """
+        resource, parts = group
+        model, sources = ENTITY_SOURCES[resource]
+        response = self._list(
+            resource,
+            tool,
+            part=",".join(("id", *parts)),
+            fields=fields_mask(source_paths(model, sources, parts)),
+            id=",".join(ids),
+            maxResults=MAX_IDS_PER_REQUEST,
+        )
+        self.cache.put(resource, response["items"], parts)
+
+        return {item["id"]: item for item in response["items"]}
+
+    def _render(
+        self,
+        results: BaseModel,
+        items_key: str | None,
+        key: str,
+        fields: list[str] | None,
+        format: str,
+        exclude_none: bool,
+        max_description_chars: int | None,
+    ) -> str:
+        """
+        Serialize the result of a tool with the output options of the call.
+        See rendering.render.
+        """
+        try:
+            return render(
+                results,
+                items_key,
+                key,
+                fields,
+                format,
+                exclude_none,
+                max_description_chars,
+            )
+        except ValueError as e:
+            return f"Error: {e}"
+
+    def _resolve_channel_id(self, channel_id: str, tool: str) -> str | None:
+        """
+        Resolve a channel ID or @handle to a channel ID.
+
+        Handles are looked up with channels().list once; the channel is stored
+        in the entity cache and the handle remembered as its alias.
+
+        Args:
+            channel_id: Channel ID starting with "UC", or a handle starting with "@".
+            tool: Name of the tool the lookup is made for.
+
+        Returns:
+            str: The channel ID, or None if the handle does not exist
+        """
+        if not channel_id.startswith("@"):
+            return channel_id
+
+        handle = channel_id
+        channel_id = self.cache.get_alias("channels", handle)
+        if channel_id is not None:
+            return channel_id
+
+        response = self._list(
+            "channels",
+            tool,
+            part=",".join(("id", *CHANNEL_PARTS)),
+            fields=fields_mask(source_paths(ChannelInfo, CHANNEL_SOURCES)),
+            forHandle=handle,
+        )
+        if not response.get("items"):
+            return None
+
+        channel_id = response["items"][0]["id"]
+        self.cache.put("channels", response["items"], CHANNEL_PARTS)
+        self.cache.put_alias("channels", handle, channel_id)
+
+        return channel_id
+
+    def get_channel_info(
+        self,
+        channel_id: str,
+        fields: list[str] | None = None,
+        format: str = "json",
+        exclude_none: bool = False,
+        max_description_chars: int | None = None,
+    ) -> str:
         """
         Get Information about a Youtube Channel based on the provided Channel ID.
 
         Args:
             channel_id: The ID of Youtube Channel.
+            fields: Only return these ChannelInfo fields.
+            format: "json", "columnar" (column names once, then one row per
+                result) or "tsv".
+            exclude_none: Leave out fields that have no value.
+            max_description_chars: Truncate descriptions to this many characters.
 
         Returns:
             ChannelInfo: Information about the Youtube Channel
         """
 
-        if channel_id.startswith("UC"):
-            request = self.service.channels().list(
-                part="snippet, statistics", id=channel_id
-            )
-        elif channel_id.startswith("@"):
-            request = self.service.channels().list(
-                part="snippet, statistics", forHandle=channel_id
-            )
-        else:
+        if not channel_id.startswith(("UC", "@")):
             return "Invalid Channel ID"
 
-        response = request.execute()
-
-        channel_info = ChannelInfo(
-            channel_id=response["items"][0].get("id"),
-            channel_title=response["items"][0]["snippet"].get("title"),
-            description=response["items"][0]["snippet"].get("description"),
-            published_at=response["items"][0]["snippet"].get("publishedAt"),
-            country=response["items"][0]["snippet"].get("country"),
-            view_count=response["items"][0]["statistics"].get("viewCount"),
-            subscriber_count=response["items"][0]["statistics"].get("subscriberCount"),
-            video_count=response["items"][0]["statistics"].get("videoCount"),
+        try:
+            channel_id = self._resolve_channel_id(channel_id, "get_channel_info")
+            if channel_id is None:
+                return "Channel Not Found"
+
+            items = self._get_entities(
+                "channels", "get_channel_info", [channel_id], CHANNEL_PARTS
+            )
+        except QuotaExceededError as e:
+            return f"Error: {e}"
+        if channel_id not in items:
+            return "Channel Not Found"
+
+        channel_info = ChannelInfo.model_validate(channel_fields(items[channel_id]))
+        self.catalog.add([channel_info])
+
+        return self._render(
+            channel_info,
+            None,
+            "channel_id",
+            fields,
+            format,
+            exclude_none,
+            max_description_chars,
         )
 
-        return channel_info.model_dump_json()
+    def _search_page(
+        self, tool: str, query: dict, cursor: str | None, max_results: int
+    ) -> tuple[dict, str | None]:
+        """
+        Fetch one page of search results.
+
+        Pages are cached, so resuming a cursor or repeating a search serves the
+        page from the entity cache without spending quota.
+
+        Args:
+            tool: Name of the tool the search is made for.
+            query: search.list parameters other than the part and paging.
+            cursor: Cursor returned with the previous page, None for the first one.
+            max_results: Page size, at most 50.
+
+        Returns:
+            tuple: The API response and the cursor of the next page, or None if
+                this is the last page
+
+        Raises:
+            ValueError: If the cursor is invalid or was issued by another tool.
+        """
+        page_token = None
+        if cursor:
+            query, page_token = decode_cursor(tool, cursor, query)
+        else:
+            query = {key: value for key, value in query.items() if value is not None}
+
+        params = {
+            **query,
+            "part": "snippet",
+            "fields": SEARCH_FIELDS[query["type"]],
+            "maxResults": min(max_results, 50),
+            "pageToken": page_token,
+        }
+        key = request_key("search", params)
+
+        response = self.cache.get_page(key)
+        if response is None:
+            response = self._list("search", tool, **params)
+            self.cache.put_page(key, response)
+
+        next_page_token = response.get("nextPageToken")
+        if not next_page_token:
+            return response, None
+
+        return response, encode_cursor(tool, query, next_page_token)
 
     def search_channel(
         self,
@@ -156,58 +1078,87 @@ class YoutubeTool:
         region_code: str = "US",
         order: str = "relevance",
         max_results: int = 50,
+        enrich: bool = False,
+        cursor: str = None,
+        fields: list[str] | None = None,
+        format: str = "json",
+        exclude_none: bool = False,
+        max_description_chars: int | None = None,
     ) -> str:
         """
         Searches for Youtube Channels based on provided channel Name.
+        Returns one page of results and a next_cursor to fetch the next page with.
 
         Args:
             channel_name: The name of the channel to search for.
             order: The order in which to return results. Options are date, rating, relevance, title, videoCount and viewCount
-            max_results: THe maximum number of results to return
+            max_results: The number of results per page, at most 50
+            enrich: Also fetch channel statistics and country for every result
+            cursor: next_cursor of the previous page. The search arguments it was
+                issued for are reused and the other arguments ignored.
+            fields: Only return these ChannelInfo fields.
+            format: "json", "columnar" (column names once, then one row per
+                result) or "tsv".
+            exclude_none: Leave out fields that have no value.
+            max_description_chars: Truncate descriptions to this many characters.
         """
 
-        lst = []
-        total_results = 0
-        next_page_token = None
-
-        while len(lst) < max_results:
-            current_max = min(50, max_results - len(lst))
-
-            request = self.service.search().list(
-                part="snippet",
-                q=channel_name,
-                type="channel",
-                maxResults=current_max,
-                order=order,
-                publishedAfter=published_after,
-                publishedBefore=published_before,
-                regionCode=region_code,
-                pageToken=next_page_token,
+        try:
+            response, next_cursor = self._search_page(
+                "search_channel",
+                {
+                    "q": channel_name,
+                    "type": "channel",
+                    "order": order,
+                    "publishedAfter": published_after,
+                    "publishedBefore": published_before,
+                    "regionCode": region_code,
+                },
+                cursor,
+                max_results,
             )
-            response = request.execute()
-
-            for item in response["items"]:
-                channel_id = item["id"].get("channelId")
-                channel_title = item["snippet"].get("title")
-                channel_description = item["snippet"].get("description")
-                channel_published_at = item["snippet"].get("publishedAt")
-                channel_info = ChannelInfo(
-                    channel_id=channel_id,
-                    channel_title=channel_title,
-                    description=channel_description,
-                    published_at=channel_published_at,
-                )
-                lst.append(channel_info)
+        except ValueError:
+            return "Invalid Cursor"
+        except QuotaExceededError as e:
+            return f"Error: {e}"
 
-            total_results = response["pageInfo"]["totalResults"]
-            next_page_token = response.get("nextPageToken")
-
-            if not next_page_token:
-                break
+        lst = CHANNEL_LIST.validate_python(
+            [channel_search_fields(item) for item in response["items"]]
+        )
 
-        return ChannelResults(
-            total_results=total_results, channels=lst
-        ).model_dump_json()
+        if enrich:
+            try:
+                items = self._get_entities(
+                    "channels",
+                    "search_channel",
+                    list(dict.fromkeys(channel.channel_id for channel in lst)),
+                    CHANNEL_PARTS,
+                )
+            except QuotaExceededError as e:
+                return f"Error: {e}"
+            lst = CHANNEL_LIST.validate_python(
+                [
+                    channel_fields(items[channel.channel_id])
+                    if channel.channel_id in items
+                    else channel
+                    for channel in lst
+                ]
+            )
+        self.catalog.add(lst)
+
+        return self._render(
+            ChannelResults(
+                total_results=response["pageInfo"]["totalResults"],
+                channels=lst,
+                next_cursor=next_cursor,
+            ),
+            "channels",
+            "channel_id",
+            fields,
+            format,
+            exclude_none,
+            max_description_chars,
+        )
 
     def search_playlist(
         self,
@@ -217,55 +1168,96 @@ class YoutubeTool:
         region_code: str = "US",
         order: str = "date",
         max_results: int = 50,
+        fan_out: bool = False,
+        cursor: str = None,
+        fields: list[str] | None = None,
+        format: str = "json",
+        exclude_none: bool = False,
+        max_description_chars: int | None = None,
     ) -> str:
         """
         Searches for Youtube Playlist based on provided query.
-        """
-
-        lst = []
-        total_results = 0
-        next_page_token = None
+        Returns one page of results and a next_cursor to fetch the next page with.
 
-        while len(lst) < max_results:
-            current_max = min(50, max_results - len(lst))
+        Args:
+            max_results: The number of results per page, at most 50. With
+                fan_out, the total number of results to return, taken from the
+                time windows that finish first.
+            fan_out: Search the published_after..published_before range in
+                parallel time windows to get past the ~500 result cap of a query.
+            cursor: next_cursor of the previous page. The search arguments it was
+                issued for are reused and the other arguments ignored.
+            fields: Only return these PlaylistInfo fields.
+            format: "json", "columnar" (column names once, then one row per
+                result) or "tsv".
+            exclude_none: Leave out fields that have no value.
+            max_description_chars: Truncate descriptions to this many characters.
+        """
 
-            request = self.service.search().list(
-                part="snippet",
-                q=query,
-                type="playlist",
-                maxResults=current_max,
-                order=order,
-                publishedAfter=published_after,
-                publishedBefore=published_before,
-                regionCode=region_code,
-                pageToken=next_page_token,
+        search_query = {
+            "q": query,
+            "type": "playlist",
+            "order": order,
+            "regionCode": region_code,
+        }
+        next_cursor = None
+
+        if fan_out:
+            try:
+                start, end = parse_date_range(published_after, published_before)
+            except ValueError as e:
+                return f"Error: {e}"
+
+            try:
+                items = self._fan_out_search(
+                    "search_playlist",
+                    search_query,
+                    "playlistId",
+                    start,
+                    end,
+                    max_results,
+                )
+            except QuotaExceededError as e:
+                return f"Error: {e}"
+            lst = PLAYLIST_LIST.validate_python(
+                [playlist_search_fields(item) for item in items]
             )
-            response = request.execute()
-
-            for item in response["items"]:
-                playlist_id = item["id"].get("playlistId")
-                playlist_title = item["snippet"].get("title")
-                channel_id = item["snippet"].get("channelId")
-                playlist_description = item["snippet"].get("description")
-                playlist_published_at = item["snippet"].get("publishedAt")
-                playlist_info = PlaylistInfo(
-                    playlist_id=playlist_id,
-                    playlist_title=playlist_title,
-                    channel_id=channel_id,
-                    description=playlist_description,
-                    published_at=playlist_published_at,
+            total_results = len(lst)
+
+        else:
+            try:
+                response, next_cursor = self._search_page(
+                    "search_playlist",
+                    {
+                        **search_query,
+                        "publishedAfter": published_after,
+                        "publishedBefore": published_before,
+                    },
+                    cursor,
+                    max_results,
                 )
-                lst.append(playlist_info)
+            except ValueError:
+                return "Invalid Cursor"
+            except QuotaExceededError as e:
+                return f"Error: {e}"
 
+            lst = PLAYLIST_LIST.validate_python(
+                [playlist_search_fields(item) for item in response["items"]]
+            )
             total_results = response["pageInfo"]["totalResults"]
-            next_page_token = response.get("nextPageToken")
-
-            if not next_page_token:
-                break
-
-        return PlaylistResults(
-            total_results=total_results, playlists=lst
-        ).model_dump_json()
+        self.catalog.add(lst)
+
+        return self._render(
+            PlaylistResults(
+                total_results=total_results, playlists=lst, next_cursor=next_cursor
+            ),
+            "playlists",
+            "playlist_id",
+            fields,
+            format,
+            exclude_none,
+            max_description_chars,
+        )
 
     def search_videos(
         self,
@@ -276,166 +1268,647 @@ class YoutubeTool:
         video_duration: str = "any",
         order: str = "date",
         max_results: int = 50,
+        enrich: bool = False,
+        fan_out: bool = False,
+        cursor: str = None,
+        filter: str | None = None,
+        fields: list[str] | None = None,
+        format: str = "json",
+        exclude_none: bool = False,
+        max_description_chars: int | None = None,
     ) -> str:
         """
         Searches for Youtube videos based on provided query.
-        """
-
-        lst = []
-        total_results = 0
-        next_page_token = None
+        Returns one page of results and a next_cursor to fetch the next page with.
 
-        while len(lst) < max_results:
-            current_max = min(50, max_results - len(lst))
+        Args:
+            max_results: The number of results per page, at most 50. With
+                fan_out, the total number of results to return, taken from the
+                time windows that finish first.
+            enrich: Also fetch duration, statistics and other details of every
+                result, in batched videos().list calls.
+            fan_out: Search the published_after..published_before range in
+                parallel time windows to get past the ~500 result cap of a query.
+            cursor: next_cursor of the previous page. The search arguments it was
+                issued for are reused and the other arguments ignored.
+            filter: Filter, sort and limit expression evaluated over the
+                results of this page, or of the whole fan-out, e.g.
+                "views>=100k and duration_s between 300 and 1200, sort -likes,
+                limit 20". Results are enriched when it reads fields that
+                search does not return.
+            fields: Only return these VideoInfo fields.
+            format: "json", "columnar" (column names once, then one row per
+                result) or "tsv".
+            exclude_none: Leave out fields that have no value.
+            max_description_chars: Truncate descriptions to this many characters.
+        """
 
-            request = self.service.search().list(
-                part="snippet",
-                q=query,
-                type="video",
-                maxResults=current_max,
-                order=order,
-                publishedAfter=published_after,
-                publishedBefore=published_before,
-                videoDuration=video_duration,
-                regionCode=region_code,
-                pageToken=next_page_token,
+        try:
+            result_filter = compile_filter(filter, VideoInfo) if filter else None
+        except ValueError as e:
+            return f"Error: Invalid filter: {e}"
+
+        # Statistics and durations only come from videos().list
+        _, search_sources = SEARCH_SOURCES["video"]
+        if result_filter and not result_filter.fields <= search_sources.keys():
+            enrich = True
+
+        search_query = {
+            "q": query,
+            "type": "video",
+            "order": order,
+            "videoDuration": video_duration,
+            "regionCode": region_code,
+        }
+        next_cursor = None
+        hydrated = None
+
+        if fan_out:
+            try:
+                start, end = parse_date_range(published_after, published_before)
+            except ValueError as e:
+                return f"Error: {e}"
+
+            # Hydrate the results of every window while the others are searched
+            hydrating = []
+            on_items = None
+            if enrich:
+
+                def on_items(items):
+                    hydrating.append(
+                        self._submit_entities(
+                            "videos",
+                            "search_videos",
+                            [item["id"]["videoId"] for item in items],
+                            VIDEO_PARTS,
+                        )
+                    )
+
+            try:
+                items = self._fan_out_search(
+                    "search_videos",
+                    search_query,
+                    "videoId",
+                    start,
+                    end,
+                    max_results,
+                    on_items,
+                )
+                if enrich:
+                    hydrated = {}
+                    for collect in hydrating:
+                        hydrated.update(collect())
+            except QuotaExceededError as e:
+                return f"Error: {e}"
+
+            lst = VIDEO_LIST.validate_python(
+                [video_search_fields(item) for item in items]
             )
-            response = request.execute()
-
-            for item in response["items"]:
-                channel_id = item["id"].get("channelId")
-                channel_title = item["snippet"].get("channelTitle")
-                video_id = item["id"].get("videoId")
-                video_title = item["snippet"].get("title")
-                video_description = item["snippet"].get("description")
-                video_published = item["snippet"].get("publishTime")
-                video_info = VideoInfo(
-                    channel_id=channel_id,
-                    channel_title=channel_title,
-                    video_id=video_id,
-                    video_title=video_title,
-                    description=video_description,
-                    published_at=video_published,
+            total_results = len(lst)
+
+        else:
+            try:
+                response, next_cursor = self._search_page(
+                    "search_videos",
+                    {
+                        **search_query,
+                        "publishedAfter": published_after,
+                        "publishedBefore": published_before,
+                    },
+                    cursor,
+                    max_results,
                 )
-                lst.append(video_info)
+            except ValueError:
+                return "Invalid Cursor"
+            except QuotaExceededError as e:
+                return f"Error: {e}"
 
+            lst = VIDEO_LIST.validate_python(
+                [video_search_fields(item) for item in response["items"]]
+            )
             total_results = response["pageInfo"]["totalResults"]
-            next_page_token = response.get("nextPageToken")
 
-            if not next_page_token:
-                break
+        if enrich:
+            try:
+                lst = self._hydrate_videos("search_videos", lst, hydrated)
+            except QuotaExceededError as e:
+                return f"Error: {e}"
+        self.catalog.add(lst)
+        if result_filter is not None:
+            lst = result_filter.apply(lst)
+
+        return self._render(
+            VideoResults(
+                total_results=total_results, videos=lst, next_cursor=next_cursor
+            ),
+            "videos",
+            "video_id",
+            fields,
+            format,
+            exclude_none,
+            max_description_chars,
+        )
 
-        return VideoResults(total_results=total_results, videos=lst).model_dump_json()
+    def _hydrate_videos(
+        self, tool: str, videos: list[VideoInfo], items: dict | None = None
+    ) -> list[VideoInfo]:
+        """
+        Replace videos built from search or playlist items with full videos from
+        batched videos().list calls. Videos that no longer exist are kept as is.
 
-    def get_video_info(self, video_ids: str, max_results: int = 50) -> str:
+        Args:
+            items: videos().list items that were already fetched, see
+                _submit_entities. Otherwise they are fetched here.
+        """
+        if items is None:
+            items = self._get_entities(
+                "videos",
+                tool,
+                list(dict.fromkeys(video.video_id for video in videos)),
+                VIDEO_PARTS,
+            )
+        return VIDEO_LIST.validate_python(
+            [
+                video_fields(items[video.video_id])
+                if video.video_id in items
+                else video
+                for video in videos
+            ]
+        )
+
+    def _fan_out_search(
+        self,
+        tool: str,
+        params: dict,
+        id_key: str,
+        start: datetime,
+        end: datetime,
+        max_results: int,
+        on_items: Callable[[list[dict]], None] | None = None,
+    ) -> list[dict]:
+        """
+        Search a date range by fanning out over time windows in parallel.
+
+        A single search.list query stops returning results at about 500, so the
+        range is searched as separate time windows, at most FAN_OUT_CONCURRENCY
+        at a time. A window whose first page reports more results than the cap
+        is split in one step into as many equal windows as the cap needs,
+        none shorter than MIN_FAN_OUT_WINDOW. Results of all windows are merged
+        and deduplicated by ID. When quota runs out or a request fails for
+        good, the search stops and returns the results already paid for.
+
+        Windows finish in no particular order, so when max_results stops the
+        search early the results come from the windows that finished first,
+        not necessarily the newest ones.
+
+        Args:
+            tool: Name of the tool the search is made for.
+            params: search.list parameters other than the date range and paging.
+            id_key: Key of the result ID in each item's "id", e.g. "videoId".
+            start: Start of the range, see parse_date_range.
+            end: End of the range.
+            max_results: Stop once this many unique results were collected.
+            on_items: Called with the new unique items of every window as it
+                finishes, while the other windows are still being searched.
+
+        Returns:
+            list[dict]: Unique search result items, sorted newest first
+
+        Raises:
+            QuotaExceededError: If quota ran out before any result was found.
+            HttpError: If a request failed before any result was found.
+            OSError: If the connection failed before any result was found.
+        """
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        merged = {}
+        stop = threading.Event()
+
+        def search_window(window_start, window_end):
+            items = []
+            page_token = None
+
+            while not stop.is_set():
+                try:
+                    response = self._list(
+                        "search",
+                        tool,
+                        part="snippet",
+                        fields=SEARCH_FIELDS[params["type"]],
+                        maxResults=50,
+                        publishedAfter=format_rfc3339(window_start),
+                        publishedBefore=format_rfc3339(window_end),
+                        pageToken=page_token,
+                        **params,
+                    )
+                except (
+                    QuotaExceededError,
+                    HttpError,
+                    httplib2.HttpLib2Error,
+                    OSError,
+                ) as e:
+                    # Hand back the pages of this window that were paid for
+                    return items, [], e
+                items.extend(response["items"])
+
+                total_results = response["pageInfo"]["totalResults"]
+                length = window_end - window_start
+                if (
+                    page_token is None
+                    and total_results > SEARCH_RESULT_CAP
+                    and length >= 2 * MIN_FAN_OUT_WINDOW
+                ):
+                    count = min(
+                        math.ceil(total_results / SEARCH_RESULT_CAP),
+                        length // MIN_FAN_OUT_WINDOW,
+                    )
+                    bounds = [window_start + length * i / count for i in range(count)]
+                    windows = list(zip(bounds, bounds[1:] + [window_end]))
+                    return items, windows, None
+
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+
+            return items, [], None
+
+        first_error = None
+        with ThreadPoolExecutor(
+            max_workers=self.FAN_OUT_CONCURRENCY, thread_name_prefix="youtube-fan-out"
+        ) as executor:
+            pending = {executor.submit(search_window, start, end)}
+
+            try:
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        items, windows, error = future.result()
+                        if error is not None:
+                            # Keep the windows that were already paid for
+                            first_error = first_error or error
+                            stop.set()
+
+                        new_items = []
+                        for item in items:
+                            item_id = item["id"].get(id_key)
+                            if item_id not in merged:
+                                merged[item_id] = item
+                                new_items.append(item)
+                        if on_items is not None and new_items:
+                            on_items(new_items)
+                        if len(merged) >= max_results:
+                            stop.set()
+
+                        if not stop.is_set():
+                            pending.update(
+                                executor.submit(search_window, *window)
+                                for window in windows
+                            )
+            except BaseException:
+                stop.set()
+                raise
+
+        if first_error is not None and not merged:
+            raise first_error
+
+        items = sorted(
+            merged.values(),
+            key=lambda item: item["snippet"].get("publishedAt", ""),
+            reverse=True,
+        )
+        return items[:max_results]
+
+    def get_video_info(
+        self,
+        video_ids: str | list[str],
+        max_results: int | None = None,
+        filter: str | None = None,
+        fields: list[str] | None = None,
+        format: str = "json",
+        exclude_none: bool = False,
+        max_description_chars: int | None = None,
+    ) -> str:
         """
         Retrieves detailed information about Youtube Videos based on the provided video IDs.
+        Recently fetched videos are served from the local entity cache.
+
+        Args:
+            video_ids: Video IDs or URLs, as a list or a comma/whitespace separated string.
+            max_results: Optional cap on the number of unique IDs to look up.
+            filter: Filter, sort and limit expression evaluated over the
+                results before they are returned, e.g. "views>=100k and
+                duration_s between 300 and 1200, sort -likes, limit 20".
+            fields: Only fetch and return these VideoInfo fields, e.g.
+                ["view_count", "like_count"]. Only the API parts they need are
+                requested.
+            format: "json", "columnar" (column names once, then one row per
+                result) or "tsv".
+            exclude_none: Leave out fields that have no value.
+            max_description_chars: Truncate descriptions to this many characters.
+
+        Returns:
+            VideoResults: Videos in input order, plus the IDs that were not found
         """
 
-        if len(video_ids) == 1:
-            video_ids = extract_video_id(video_ids)
-            if not video_ids:
-                return "Error: Invalid Video ID or Url"
+        ids = parse_video_ids(video_ids)
+        if not ids:
+            return "Error: Invalid Video ID or Url"
+        if max_results is not None:
+            ids = ids[:max_results]
+
+        try:
+            result_filter = compile_filter(filter, VideoInfo) if filter else None
+        except ValueError as e:
+            return f"Error: Invalid filter: {e}"
+
+        parts = VIDEO_PARTS
+        if fields:
+            fields = list(dict.fromkeys(["video_id", *fields]))
+            # Fields the filter reads are fetched too, but not returned
+            fetched = fields
+            if result_filter is not None:
+                fetched = list(dict.fromkeys([*fields, *result_filter.fields]))
+            try:
+                # Fetch at least one part to tell which videos exist
+                parts = parts_for_fields(VIDEO_SOURCES, fetched) or ["snippet"]
+            except ValueError as e:
+                return f"Error: {e}"
+
+        try:
+            items = self._get_entities("videos", "get_video_info", ids, parts)
+        except QuotaExceededError as e:
+            return f"Error: {e}"
+
+        if fields:
+            lst = [
+                model_from_item(VideoInfo, VIDEO_SOURCES, items[video_id], fetched)
+                for video_id in ids
+                if video_id in items
+            ]
+        else:
+            lst = VIDEO_LIST.validate_python(
+                [video_fields(items[video_id]) for video_id in ids if video_id in items]
+            )
+        not_found = [video_id for video_id in ids if video_id not in items]
+        self.catalog.add(lst)
+        if result_filter is not None:
+            lst = result_filter.apply(lst)
+
+        return self._render(
+            VideoResults(total_results=len(lst), videos=lst, not_found=not_found),
+            "videos",
+            "video_id",
+            fields,
+            format,
+            exclude_none,
+            max_description_chars,
+        )
+
+    def get_channel_videos(
+        self,
+        channel_id: str,
+        max_results: int = 50,
+        since_last_sync: bool = False,
+        filter: str | None = None,
+        fields: list[str] | None = None,
+        format: str = "json",
+        exclude_none: bool = False,
+        max_description_chars: int | None = None,
+    ) -> str:
+        """
+        Retrieves videos uploaded by Youtube channel based on provided channel id.
+
+        Videos are read from the channel's uploads playlist, newest first.
+
+        Args:
+            channel_id: Channel ID starting with "UC", or a handle starting with "@".
+            max_results: The maximum number of videos to return.
+            since_last_sync: Only return videos published after the newest video
+                returned by the previous call with since_last_sync.
+            filter: Filter, sort and limit expression evaluated over the
+                fetched uploads before they are returned, e.g. "views>=100k and
+                duration_s between 300 and 1200, sort -likes, limit 20".
+                Uploads are enriched when it reads fields other than the
+                title, description, channel and publish time.
+            fields: Only return these VideoInfo fields.
+            format: "json", "columnar" (column names once, then one row per
+                result) or "tsv".
+            exclude_none: Leave out fields that have no value.
+            max_description_chars: Truncate descriptions to this many characters.
+
+        Returns:
+            VideoResults: Uploaded videos, newest first
+        """
+
+        if not channel_id.startswith(("UC", "@")):
+            return "Invalid Channel ID"
+
+        try:
+            result_filter = compile_filter(filter, VideoInfo) if filter else None
+        except ValueError as e:
+            return f"Error: Invalid filter: {e}"
+
+        try:
+            channel_id = self._resolve_channel_id(channel_id, "get_channel_videos")
+        except QuotaExceededError as e:
+            return f"Error: {e}"
+        if channel_id is None:
+            return "Channel Not Found"
+
+        # The uploads playlist ID is the channel ID with a "UU" prefix
+        uploads_playlist_id = "UU" + channel_id[2:]
+        watermark = (
+            self.cache.get_watermark("uploads", channel_id) if since_last_sync else None
+        )
+        last_synced = parse_rfc3339(watermark) if watermark else None
+        synced = self._get_synced_ranges(channel_id) if since_last_sync else []
 
         lst = []
         total_results = 0
         next_page_token = None
+        caught_up = False
+        exhausted = False
+        # Publish times of the uploads the crawl went through, returned or not
+        crawled = []
 
-        while len(lst) < max_results:
+        while len(lst) < max_results and not caught_up:
             current_max = min(50, max_results - len(lst))
 
-            request = self.service.videos().list(
-                part="id,snippet,contentDetails,statistics,paidProductPlacementDetails,TopicDetails",
-                id=video_ids,
-                maxResults=current_max,
-                pageToken=next_page_token,
-            )
-            response = request.execute()
-
-            for item in response["items"]:
-                snippet = item["snippet"]
-                content_details = item.get("contentDetails", {})
-                statistics = item.get("statistics", {})
-                topic_details = item.get("topicDetails", {})
-
-                video_info = VideoInfo(
-                    channel_id=snippet["channelId"],
-                    channel_title=snippet["channelTitle"],
-                    video_id=item["id"],
-                    video_title=snippet["title"],
-                    description=snippet.get("description", ""),
-                    published_at=snippet["publishedAt"],
-                    tags=snippet.get("tags", []),
-                    duration=content_details.get("duration"),
-                    dimension=content_details.get("dimension"),
-                    view_count=statistics.get("viewCount"),
-                    like_count=statistics.get("likeCount", 0),
-                    comment_count=statistics.get("commentCount", 0),
-                    topic_categories=topic_details.get("topicCategories", []),
-                    has_paid_product_placement=snippet.get("hasPaidPromotion", False),
+            try:
+                response = self._list(
+                    "playlistItems",
+                    "get_channel_videos",
+                    part="snippet,contentDetails",
+                    fields=UPLOAD_FIELDS,
+                    playlistId=uploads_playlist_id,
+                    maxResults=current_max,
+                    pageToken=next_page_token,
                 )
-                lst.append(video_info)
+            except QuotaExceededError as e:
+                # Keep the pages that were already paid for
+                if lst:
+                    break
+                return f"Error: {e}"
+
+            page = VIDEO_LIST.validate_python(
+                [upload_fields(item) for item in response["items"]]
+            )
+            for video in page:
+                if last_synced is not None and video.published_at <= last_synced:
+                    caught_up = True
+                    break
+                crawled.append(video.published_at)
+                # Returned by an earlier sync that stopped before the watermark
+                if any(old <= video.published_at <= new for old, new in synced):
+                    continue
+                lst.append(video)
 
             total_results = response["pageInfo"]["totalResults"]
             next_page_token = response.get("nextPageToken")
 
             if not next_page_token:
+                exhausted = True
                 break
 
-        return VideoResults(total_results=total_results, videos=lst).model_dump_json()
+        if since_last_sync:
+            total_results = len(lst)
+            self._save_sync(
+                channel_id, last_synced, synced, crawled, caught_up or exhausted
+            )
+
+        # Filters on statistics or durations need the full videos
+        if result_filter and not result_filter.fields <= UPLOAD_SOURCES.keys():
+            try:
+                lst = self._hydrate_videos("get_channel_videos", lst)
+            except QuotaExceededError as e:
+                return f"Error: {e}"
+        self.catalog.add(lst)
+        if result_filter is not None:
+            lst = result_filter.apply(lst)
+
+        return self._render(
+            VideoResults(total_results=total_results, videos=lst),
+            "videos",
+            "video_id",
+            fields,
+            format,
+            exclude_none,
+            max_description_chars,
+        )
 
-    def get_channel_videos(self, channel_id: str, max_results: int = 50) -> str:
+    def _get_synced_ranges(self, channel_id: str) -> list[tuple[datetime, datetime]]:
         """
-        Retrieves videos uploaded by Youtube channel based on provided channel id.
+        Publish time ranges of uploads above the watermark that were already
+        returned by syncs of a channel that stopped early.
         """
+        saved = self.cache.get_watermark("uploads_synced", channel_id)
+        return [
+            (parse_rfc3339(oldest), parse_rfc3339(newest))
+            for oldest, newest in json.loads(saved or "[]")
+        ]
 
-        lst = []
-        total_results = 0
-        next_page_token = None
+    def _save_sync(
+        self,
+        channel_id: str,
+        last_synced: datetime | None,
+        synced: list[tuple[datetime, datetime]],
+        crawled: list[datetime],
+        complete: bool,
+    ) -> None:
+        """
+        Save how far a since_last_sync crawl of a channel's uploads got.
 
-        while len(lst) < max_results:
+        A crawl that reached the watermark or the end of the uploads moves the
+        watermark to the newest upload. A crawl that stopped early, at
+        max_results or when quota ran out, keeps the watermark and records the
+        range it went through. The next sync then skips the uploads in that range
+        and goes on to fill the gap below it.
 
-            request = self.service.videos().list(
-                part="contentDetails",
-                id=channel_id,
-            )
-            response = request.execute()
+        Args:
+            channel_id: Channel ID.
+            last_synced: The current watermark.
+            synced: Ranges recorded by earlier crawls that stopped early.
+            crawled: Publish times of the uploads this crawl went through.
+            complete: Whether the crawl reached the watermark or the end.
+        """
+        newest = max([*crawled, *(new for _, new in synced)], default=None)
+
+        if complete:
+            if newest is not None and (last_synced is None or newest > last_synced):
+                self.cache.put_watermark("uploads", channel_id, newest.isoformat())
+            if synced:
+                self.cache.put_watermark("uploads_synced", channel_id, "[]")
+            return
+
+        if not crawled:
+            return
+
+        # The crawl went through everything from the newest upload down to the
+        # oldest one it saw, including the ranges it passed
+        reached = min(crawled)
+        ranges = [(old, new) for old, new in synced if new < reached]
+        ranges.append(
+            (min([reached, *(old for old, new in synced if new >= reached)]), newest)
+        )
+        self.cache.put_watermark(
+            "uploads_synced",
+            channel_id,
+            json.dumps([[old.isoformat(), new.isoformat()] for old, new in ranges]),
+        )
+
+    def get_quota_status(self) -> str:
+        """
+        Get today's Youtube Data API quota usage and remaining budget.
 
-            uploads_playlist_id = response["items"][0]["contentDetails"][
-                "relatedPlaylists"
-            ].get("uploads")
+        Returns:
+            QuotaReport: Quota usage in total, per credential and per tool
+        """
+        credentials = [QuotaStatus(**status) for status in self.pool.status()]
 
-            current_max = min(50, max_results - len(lst))
+        return QuotaReport(
+            used=sum(status.used for status in credentials),
+            remaining=sum(status.remaining for status in credentials),
+            credentials=credentials,
+        ).model_dump_json()
 
-            playlist_request = self.service.playlistItems().list(
-                part="snippet",
-                playlistId=uploads_playlist_id,
-                maxResults=current_max,
-                pageToken=next_page_token,
-            )
+    def query_catalog(self, sql: str, max_rows: int = 100) -> str:
+        """
+        Query the local catalog of every video, channel and playlist fetched so
+        far, without using any API quota.
 
-            playlist_response = playlist_request.execute()
+        The catalog has the tables videos, channels and playlists, with one
+        column per VideoInfo, ChannelInfo and PlaylistInfo field plus
+        updated_at, the Unix time the row was last written. Counts are integers,
+        published_at is an ISO 8601 UTC timestamp, and tags and
+        topic_categories are JSON arrays.
 
-            for item in response["items"]:
-                snippet = item["snippet"]
+        Args:
+            sql: A single read-only SELECT statement, e.g. "SELECT video_title,
+                view_count FROM videos WHERE channel_id = 'UC...' ORDER BY
+                view_count DESC LIMIT 10".
+            max_rows: Maximum number of rows to return.
 
-                video_info = VideoInfo(
-                    channel_id=snippet["channelId"],
-                    channel_title=snippet["channelTitle"],
-                    video_id=item["resourceId"]["id"],
-                    video_title=snippet["title"],
-                    description=snippet.get("description", ""),
-                    published_at=snippet["publishedAt"],
-                )
-                lst.append(video_info)
+        Returns:
+            CatalogRows: Column names and rows of the result
+        """
+        try:
+            result = self.catalog.query(sql, max_rows)
+        except sqlite3.Error as e:
+            return f"Error: {e}"
 
-            total_results = response["pageInfo"]["totalResults"]
-            next_page_token = response.get("nextPageToken")
+        return CatalogRows(**result).model_dump_json()
 
-            if not next_page_token:
-                break
+    def get_request_stats(self) -> str:
+        """
+        Get metrics of request batching and coalescing since the server started.
 
-        return VideoResults(total_results=total_results, videos=lst).model_dump_json()
+        Returns:
+            RequestStats: Batch size and coalescing metrics
+        """
+        return RequestStats(
+            **self.loader.stats(), coalesced_requests=self.single_flight.coalesced
+        ).model_dump_json()
 
     def construct_hyperlink(self, id: str, type: str) -> str:
         """